@@ -0,0 +1 @@
+"""Benchmarks for the Geek Magic integration."""
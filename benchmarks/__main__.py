@@ -0,0 +1,307 @@
+"""Benchmarks for the Geek Magic integration against local fake devices.
+
+Run from the repository root, with Home Assistant installed::
+
+    python -m benchmarks
+    python -m benchmarks --latency 0.05 --compare benchmarks/results/baseline.json
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections.abc import Awaitable, Callable
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from typing import Any
+
+import aiohttp
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import device_registry as dr
+
+from custom_components.geek_magic import _async_broadcast
+from custom_components.geek_magic.api import GeekMagicApiClient
+from custom_components.geek_magic.const import CONF_MAX_PARALLEL, DEFAULT_MAX_PARALLEL, DISPLAY_SIZE
+from custom_components.geek_magic.image import prepare_animation, reencode_jpeg, resize_image
+from custom_components.geek_magic.renderer import render_text
+
+from .fake_device import FakeDevice, FakeRenderer
+
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), "results")
+# Medians slower than the baseline by more than this are reported as regressions
+REGRESSION_THRESHOLD = 0.10
+
+
+class Benchmark:
+    """A named benchmark."""
+
+    def __init__(self, name: str, run: Callable[[argparse.Namespace], Awaitable[dict[str, Any]]]) -> None:
+        self.name = name
+        self.run = run
+
+
+def _summary(samples: list[float], **extra: Any) -> dict[str, Any]:
+    """Summarize timings (seconds) as milliseconds."""
+    ordered = sorted(samples)
+    p95 = ordered[min(len(ordered) - 1, round(0.95 * (len(ordered) - 1)))]
+    return {
+        "n": len(samples),
+        "min_ms": round(ordered[0] * 1000, 3),
+        "median_ms": round(statistics.median(ordered) * 1000, 3),
+        "p95_ms": round(p95 * 1000, 3),
+        "mean_ms": round(statistics.fmean(ordered) * 1000, 3),
+        **extra,
+    }
+
+
+async def _timed(runs: int, action: Callable[[], Awaitable[Any]]) -> list[float]:
+    samples = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        await action()
+        samples.append(time.perf_counter() - started)
+    return samples
+
+
+def _sample_jpeg(size: tuple[int, int]) -> bytes:
+    """Return a photo-like JPEG with detail, so encoders have work to do."""
+    from PIL import Image
+
+    img = Image.effect_mandelbrot(size, (-2.0, -1.2, 0.8, 1.2), 64).convert("RGB")
+    output = io.BytesIO()
+    img.save(output, format="JPEG", quality=90)
+    return output.getvalue()
+
+
+def _sample_gif(frames: int, size: tuple[int, int]) -> bytes:
+    from PIL import Image
+
+    images = [
+        Image.effect_mandelbrot(size, (-2.0 + i * 0.02, -1.2, 0.8, 1.2), 32).convert("P")
+        for i in range(frames)
+    ]
+    output = io.BytesIO()
+    images[0].save(output, format="GIF", save_all=True, append_images=images[1:], duration=80, loop=0)
+    return output.getvalue()
+
+
+async def bench_refresh(args: argparse.Namespace) -> dict[str, Any]:
+    """Time a full coordinator refresh: state, free space and image list."""
+    device = FakeDevice(latency=args.latency, max_connections=args.connections)
+    client = GeekMagicApiClient(await device.start())
+    try:
+        async def _refresh() -> None:
+            await asyncio.gather(client.async_get_data(), client.async_get_space(), client.async_get_images())
+
+        samples = await _timed(args.runs, _refresh)
+        return _summary(samples, requests=device.requests)
+    finally:
+        await client.async_close()
+        await device.stop()
+
+
+async def bench_state_poll(args: argparse.Namespace) -> dict[str, Any]:
+    """Time a state-only refresh (theme, brightness, model)."""
+    device = FakeDevice(latency=args.latency, max_connections=args.connections)
+    client = GeekMagicApiClient(await device.start())
+    try:
+        return _summary(await _timed(args.runs, client.async_get_data))
+    finally:
+        await client.async_close()
+        await device.stop()
+
+
+async def bench_upload(args: argparse.Namespace) -> dict[str, Any]:
+    """Time uploads of a typical album image and report throughput."""
+    payload = resize_image(_sample_jpeg((1600, 1200)), "crop")
+    device = FakeDevice(latency=args.latency, upload_rate=args.upload_rate, max_connections=args.connections)
+    client = GeekMagicApiClient(await device.start())
+    try:
+        samples = await _timed(args.runs, lambda: client.async_upload_file(payload, "bench.jpg"))
+        median = statistics.median(samples)
+        return _summary(samples, bytes=len(payload), kb_per_s=round(len(payload) / 1024 / median, 1))
+    finally:
+        await client.async_close()
+        await device.stop()
+
+
+async def bench_broadcast(args: argparse.Namespace) -> dict[str, Any]:
+    """Time sending one image to many devices through the broadcast helper of the services."""
+    payload = resize_image(_sample_jpeg((1600, 1200)), "crop")
+    devices = [
+        FakeDevice(latency=args.latency, upload_rate=args.upload_rate, max_connections=args.connections)
+        for _ in range(args.devices)
+    ]
+    # Stand-ins for the service call and the coordinators, with the parts the helper uses
+    call = SimpleNamespace(data={CONF_MAX_PARALLEL: DEFAULT_MAX_PARALLEL})
+    coordinators = [
+        SimpleNamespace(client=GeekMagicApiClient(await device.start()),
+                        config_entry=SimpleNamespace(entry_id=f"bench_{index}"))
+        for index, device in enumerate(devices)
+    ]
+
+    async def _send(coordinator: Any) -> None:
+        await coordinator.client.async_upload_file(payload, "bench.jpg")
+        await coordinator.client.async_set_image("bench.jpg", None, True)
+
+    async def _broadcast() -> None:
+        results = await _async_broadcast(hass, call, coordinators, _send, "benchmarking")
+        if failed := [result["error"] for result in results["devices"].values() if not result["success"]]:
+            raise RuntimeError(f"Broadcast failed on {len(failed)} devices: {failed[0]}")
+
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = HomeAssistant(config_dir)
+        await dr.async_load(hass)
+        try:
+            samples = await _timed(args.runs, _broadcast)
+            return _summary(samples, devices=len(devices), max_parallel=DEFAULT_MAX_PARALLEL)
+        finally:
+            for coordinator in coordinators:
+                await coordinator.client.async_close()
+            for device in devices:
+                await device.stop()
+            await hass.async_stop(force=True)
+
+
+async def bench_render_remote(args: argparse.Namespace) -> dict[str, Any]:
+    """Time rendering through the render service and re-encoding for the device."""
+    renderer = FakeRenderer(latency=args.latency)
+    url = f"{await renderer.start()}/render"
+    try:
+        async with aiohttp.ClientSession() as session:
+            async def _render() -> None:
+                async with session.post(url, json={"html": "<p>benchmark</p>", "cache": "false"}) as resp:
+                    reencode_jpeg(await resp.read())
+
+            return _summary(await _timed(args.runs, _render))
+    finally:
+        await renderer.stop()
+
+
+def _sync_benchmark(name: str, action: Callable[[], Any]) -> Benchmark:
+    async def _run(args: argparse.Namespace) -> dict[str, Any]:
+        async def _action() -> None:
+            action()
+
+        return _summary(await _timed(args.runs, _action))
+
+    return Benchmark(name, _run)
+
+
+def _preprocessing_benchmarks() -> list[Benchmark]:
+    photo = _sample_jpeg((4000, 3000))
+    png = io.BytesIO()
+    from PIL import Image
+
+    Image.open(io.BytesIO(photo)).resize(DISPLAY_SIZE).save(png, format="PNG")
+    animation = _sample_gif(60, (480, 480))
+    return [
+        _sync_benchmark("resize_photo_12mp", lambda: resize_image(photo, "crop")),
+        _sync_benchmark("reencode_png", lambda: reencode_jpeg(png.getvalue())),
+        _sync_benchmark("prepare_animation_60_frames", lambda: prepare_animation(animation, "stretch")),
+        _sync_benchmark("render_text_local", lambda: render_text("Benchmark", "The quick brown fox " * 8)),
+    ]
+
+
+def _benchmarks() -> list[Benchmark]:
+    return [
+        Benchmark("state_poll", bench_state_poll),
+        Benchmark("refresh", bench_refresh),
+        Benchmark("upload", bench_upload),
+        Benchmark("broadcast", bench_broadcast),
+        Benchmark("render_remote", bench_render_remote),
+        *_preprocessing_benchmarks(),
+    ]
+
+
+def _git_revision() -> str | None:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              check=True, cwd=os.path.dirname(__file__)).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _compare(results: dict[str, Any], baseline: dict[str, Any]) -> list[str]:
+    """Print median changes against a baseline and return the names of regressions."""
+    regressions = []
+    print(f"\nCompared with {baseline.get('revision') or 'baseline'} ({baseline.get('timestamp')}):")
+    for name, result in results["benchmarks"].items():
+        if (before := baseline.get("benchmarks", {}).get(name)) is None:
+            print(f"  {name:<30} new")
+            continue
+        change = result["median_ms"] / before["median_ms"] - 1 if before["median_ms"] else 0.0
+        flag = ""
+        if change > REGRESSION_THRESHOLD:
+            flag = "  REGRESSION"
+            regressions.append(name)
+        print(f"  {name:<30} {before['median_ms']:>10.2f} -> {result['median_ms']:>10.2f} ms ({change:+.1%}){flag}")
+    return regressions
+
+
+async def _async_main(args: argparse.Namespace) -> int:
+    selected = set(args.only.split(",")) if args.only else None
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+
+    results: dict[str, Any] = {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "revision": _git_revision(),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "options": {
+            "runs": args.runs,
+            "latency": args.latency,
+            "upload_rate": args.upload_rate,
+            "devices": args.devices,
+            "connections": args.connections,
+        },
+        "benchmarks": {},
+    }
+
+    for benchmark in _benchmarks():
+        if selected is not None and benchmark.name not in selected:
+            continue
+        result = await benchmark.run(args)
+        results["benchmarks"][benchmark.name] = result
+        print(f"{benchmark.name:<30} median {result['median_ms']:>10.2f} ms  p95 {result['p95_ms']:>10.2f} ms")
+
+    output = args.output or os.path.join(RESULTS_DIR, f"{results['timestamp'].replace(':', '')}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+    print(f"\nResults saved to {output}")
+
+    if baseline is not None and _compare(results, baseline):
+        return 1
+    return 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=20, help="samples per benchmark (default: 20)")
+    parser.add_argument("--latency", type=float, default=0.0,
+                        help="seconds added to every fake device and render request (default: 0)")
+    parser.add_argument("--upload-rate", type=float, default=None,
+                        help="fake device upload speed in bytes per second (default: unlimited)")
+    parser.add_argument("--devices", type=int, default=8, help="devices in the broadcast benchmark (default: 8)")
+    parser.add_argument("--connections", type=int, default=2,
+                        help="connections a fake device serves at once, more wait (default: 2)")
+    parser.add_argument("--only", help="comma-separated benchmark names to run")
+    parser.add_argument("--output", help="results file (default: benchmarks/results/<timestamp>.json)")
+    parser.add_argument("--compare", help="earlier results file to compare medians against")
+    return asyncio.run(_async_main(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
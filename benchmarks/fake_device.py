@@ -0,0 +1,210 @@
+"""Local stand-ins for a Geek Magic device and the HTML render service."""
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import io
+import json
+import re
+from urllib.parse import parse_qs, urlsplit
+
+
+class _FakeHttpServer:
+    """Minimal HTTP/1.1 server with keep-alive, for benchmarking against localhost."""
+
+    def __init__(self, latency: float = 0.0, max_connections: int | None = None) -> None:
+        self.latency = latency
+        # Connections beyond the limit wait until an open one closes, like in the device's listen backlog
+        self._slots = asyncio.Semaphore(max_connections) if max_connections else None
+        self._server: asyncio.AbstractServer | None = None
+        self._connections: dict[asyncio.Task, asyncio.StreamWriter] = {}
+        self.requests = 0
+        self.url = ""
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        """Start listening and return the base URL."""
+        self._server = await asyncio.start_server(self._handle, host, port)
+        host, port = self._server.sockets[0].getsockname()[:2]
+        self.url = f"http://{host}:{port}"
+        return self.url
+
+    async def stop(self) -> None:
+        """Stop listening and close open connections."""
+        if self._server is not None:
+            self._server.close()
+            # Connections waiting for a slot get it once the open ones end, then see theirs closed too
+            for writer in self._connections.values():
+                writer.close()
+            await asyncio.gather(*self._connections, return_exceptions=True)
+            await self._server.wait_closed()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        task = asyncio.current_task()
+        self._connections[task] = writer
+        try:
+            async with self._slots or contextlib.nullcontext():
+                await self._serve(reader, writer)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            return
+        finally:
+            del self._connections[task]
+            writer.close()
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        while True:
+            request_line = await reader.readline()
+            if not request_line:
+                return
+            method, target, _ = request_line.decode("latin-1").split(" ", 2)
+
+            headers: dict[str, str] = {}
+            while (line := await reader.readline()) not in (b"\r\n", b"\n", b""):
+                name, _, value = line.decode("latin-1").partition(":")
+                headers[name.strip().lower()] = value.strip()
+            body = await reader.readexactly(int(headers.get("content-length", 0)))
+
+            response = await self._respond(method, target, headers, body)
+            self.requests += 1
+
+            writer.write(response)
+            await writer.drain()
+            if headers.get("connection", "").lower() == "close":
+                return
+
+    async def _respond(self, method: str, target: str, headers: dict[str, str], body: bytes) -> bytes:
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        status, content_type, payload = await self.route(method, target, headers, body)
+        return self.encode_response(status, content_type, payload)
+
+    def encode_response(self, status: int, content_type: str, payload: bytes) -> bytes:
+        """Return a complete HTTP response."""
+        reason = {200: "OK", 400: "Bad Request", 404: "Not Found"}.get(status, "Error")
+        head = [
+            f"HTTP/1.1 {status} {reason}",
+            f"Content-Type: {content_type}",
+            f"Content-Length: {len(payload)}",
+            "Connection: keep-alive",
+        ]
+        return ("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + payload
+
+    async def route(self, method: str, target: str, headers: dict[str, str],
+                    body: bytes) -> tuple[int, str, bytes]:
+        """Return status, content type and body for a request."""
+        raise NotImplementedError
+
+
+class FakeDevice(_FakeHttpServer):
+    """Emulates the HTTP API of a Geek Magic display.
+
+    Like the real firmware it sends every Content-Length header twice and serves
+    at most ``max_connections`` connections; further connections wait until an
+    open one is closed. ``latency`` is added to every request and uploads are
+    slowed down to ``upload_rate`` bytes per second.
+    """
+
+    def __init__(self, latency: float = 0.0, upload_rate: float | None = None, model: str = "SmallTV-Ultra",
+                 free: int = 2 * 1024 * 1024, max_connections: int = 2) -> None:
+        super().__init__(latency, max_connections)
+        self.upload_rate = upload_rate
+        self.model = model
+        self.free = free
+        self.theme = 1
+        self.brt = 50
+        self.image: str | None = None
+        self.files: dict[str, dict[str, int]] = {"/image/": {}, "/gif/": {}}
+
+    def encode_response(self, status: int, content_type: str, payload: bytes) -> bytes:
+        response = super().encode_response(status, content_type, payload)
+        # The firmware repeats the header
+        return response.replace(b"\r\n\r\n", f"\r\nContent-Length: {len(payload)}\r\n\r\n".encode(), 1)
+
+    async def route(self, method: str, target: str, headers: dict[str, str],
+                    body: bytes) -> tuple[int, str, bytes]:
+        parts = urlsplit(target)
+        path = parts.path
+        params = {key: values[-1] for key, values in parse_qs(parts.query).items()}
+
+        if path == "/app.json":
+            return self._json({"theme": self.theme})
+        if path == "/brt.json":
+            return self._json({"brt": self.brt})
+        if path == "/v.json":
+            return self._json({"m": self.model, "v": "fake"})
+        if path == "/space.json":
+            used = sum(size for files in self.files.values() for size in files.values())
+            return self._json({"total": self.free + used, "free": self.free - used})
+        if path == "/filelist":
+            directory = f"{params.get('dir', '/image').rstrip('/')}/"
+            links = "".join(
+                f"<a href='{directory}{name}'>{name}</a> {size}<br>"
+                for name, size in self.files.get(directory, {}).items()
+            )
+            return 200, "text/html", f"<html><body>{links}</body></html>".encode()
+        if path == "/set":
+            if "theme" in params:
+                self.theme = int(params["theme"])
+            if "brt" in params:
+                self.brt = int(params["brt"])
+            if "img" in params:
+                self.image = params["img"]
+            return self._text("OK")
+        if path == "/delete":
+            directory, _, name = params.get("file", "").rpartition("/")
+            if self.files.get(f"{directory}/", {}).pop(name, None) is None:
+                return self._text("FAIL")
+            return self._text("OK")
+        if path == "/doUpload" and method == "POST":
+            return await self._upload(params.get("dir", "/image/"), body)
+
+        return 404, "text/plain", b"Not Found"
+
+    async def _upload(self, directory: str, body: bytes) -> tuple[int, str, bytes]:
+        match = re.search(rb'filename="([^"]+)"', body)
+        if match is None or directory not in self.files:
+            return 400, "text/plain", b"Bad Request"
+        if self.upload_rate:
+            await asyncio.sleep(len(body) / self.upload_rate)
+        # Approximate file size: the multipart framing is counted too
+        self.files[directory][match.group(1).decode()] = len(body)
+        return self._text("OK")
+
+    @staticmethod
+    def _json(data: dict) -> tuple[int, str, bytes]:
+        return 200, "application/json", json.dumps(data).encode()
+
+    @staticmethod
+    def _text(text: str) -> tuple[int, str, bytes]:
+        return 200, "text/plain", text.encode()
+
+
+class FakeRenderer(_FakeHttpServer):
+    """Emulates the HTML render service, answering POST /render with a 240x240 PNG."""
+
+    def __init__(self, latency: float = 0.0) -> None:
+        super().__init__(latency)
+        self._image: bytes | None = None
+
+    async def route(self, method: str, target: str, headers: dict[str, str],
+                    body: bytes) -> tuple[int, str, bytes]:
+        if method != "POST" or urlsplit(target).path != "/render":
+            return 404, "text/plain", b"Not Found"
+        try:
+            json.loads(body)["html"]
+        except (ValueError, KeyError):
+            return 400, "text/plain", b"Bad Request"
+        return 200, "image/png", self._render()
+
+    def _render(self) -> bytes:
+        if self._image is None:
+            from PIL import Image, ImageDraw
+
+            img = Image.new("RGB", (240, 240), (0, 0, 0))
+            draw = ImageDraw.Draw(img)
+            draw.text((20, 20), "Rendered", fill=(255, 165, 0))
+            for y in range(60, 240, 12):
+                draw.line((10, y, 230, y), fill=(255, 255, 255))
+            output = io.BytesIO()
+            img.save(output, format="PNG")
+            self._image = output.getvalue()
+        return self._image
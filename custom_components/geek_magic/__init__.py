@@ -1,15 +1,34 @@
 """The Geek Magic integration."""
 from __future__ import annotations
 
+import asyncio
+import glob
 import logging
+import os
+import re
+import time
+from collections.abc import Awaitable, Callable
+from functools import partial
+from string import Template
+from typing import Any
+
+import aiohttp
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import Platform
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, ServiceCall, SupportsResponse
 from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers import device_registry as dr
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
 
 from .api import GeekMagicApiClient
+from .assets import INVENTORY_KEYS
+from .cache import ImageCache, RenderCache
+from .image import async_prepare_image, prepare_animation, reencode_jpeg, resize_image, resolve_local_path
+from .renderer import can_render_locally, render_text
+from .render_service import RenderClient, parse_render_urls
+from .sequence import Frame
 from .const import (
     DOMAIN,
     CONF_IP_ADDRESS,
@@ -18,6 +37,25 @@ from .const import (
     DEFAULT_HTML_TEMPLATE,
     CONF_UPDATE_INTERVAL,
     DEFAULT_UPDATE_INTERVAL,
+    CONF_MAX_PARALLEL,
+    DEFAULT_MAX_PARALLEL,
+    CACHE_DIR,
+    DATA_RENDER_CACHE,
+    DATA_RENDER_CLIENT,
+    RENDER_CACHE_MAX_BYTES,
+    DATA_IMAGE_CACHE,
+    IMAGE_CACHE_MAX_BYTES,
+    DISPLAY_SIZE,
+    SMALL_IMAGE_SIZE,
+    DEFAULT_MAX_FRAMES,
+    MAX_SOURCE_BYTES,
+    PREPROCESS_PARALLEL,
+    DEFAULT_SLIDE_DURATION,
+    MIN_SLIDE_DURATION,
+    DEFAULT_SEQUENCE_LOOKAHEAD,
+    MAX_SEQUENCE_LOOKAHEAD,
+    DEFAULT_SEQUENCE_INTERVAL,
+    ENTRY_STORES,
 )
 
 _LOGGER = logging.getLogger(__name__)
@@ -56,6 +94,198 @@ async def _async_get_coordinators_by_device_id(
     return coordinators
 
 
+async def _async_broadcast(
+    hass: HomeAssistant,
+    call: ServiceCall,
+    coordinators: list[GeekMagicDataUpdateCoordinator],
+    action: Callable[[GeekMagicDataUpdateCoordinator], Awaitable[dict[str, Any] | None]],
+    description: str,
+) -> dict[str, Any]:
+    """Run an action on all devices concurrently and collect per-device results."""
+    semaphore = asyncio.Semaphore(max(1, int(call.data.get(CONF_MAX_PARALLEL, DEFAULT_MAX_PARALLEL))))
+
+    async def _run(coordinator: GeekMagicDataUpdateCoordinator) -> dict[str, Any]:
+        async with semaphore:
+            try:
+                result = await action(coordinator)
+            except Exception as e:  # pylint: disable=broad-except
+                _LOGGER.error("Error %s on %s: %s", description, coordinator.client.url, e)
+                return {"success": False, "error": str(e)}
+        return {"success": True, **(result or {})}
+
+    results = await asyncio.gather(*(_run(coordinator) for coordinator in coordinators))
+
+    return {
+        "devices": {
+            _device_id(hass, coordinator): result for coordinator, result in zip(coordinators, results)
+        }
+    }
+
+
+def _aydarik_coordinators(
+    coordinators: list[GeekMagicDataUpdateCoordinator],
+) -> list[GeekMagicDataUpdateCoordinator]:
+    """Return the devices running the custom firmware, which some services need.
+
+    The model is known once a device has been polled; until then it is not included.
+    """
+    supported = [coordinator for coordinator in coordinators if coordinator.data.is_aydarik]
+    if coordinators and not supported:
+        raise HomeAssistantError("This service is supported by the aydarik firmware only")
+    return supported
+
+
+def _device_id(hass: HomeAssistant, coordinator: GeekMagicDataUpdateCoordinator) -> str:
+    """Return the device registry ID of a coordinator's device, or its entry ID."""
+    entry_id = coordinator.config_entry.entry_id
+    device_entry = dr.async_get(hass).async_get_device(identifiers={(DOMAIN, entry_id)})
+    return device_entry.id if device_entry else entry_id
+
+
+def _image_filename(filename: str) -> str:
+    """Return a device filename given with or without its extension; images without one are JPEGs."""
+    if os.path.splitext(filename)[1].lower() in (".jpg", ".jpeg", ".gif"):
+        return filename
+    return f"{filename}.jpg"
+
+
+def _source_filename(source: str, extension: str) -> str:
+    """Derive a device filename from an image path or URL."""
+    name = os.path.basename(source.split("?", 1)[0].rstrip("/"))
+    stem = re.sub(r"[^A-Za-z0-9_-]+", "_", os.path.splitext(name)[0]).strip("_") or "image"
+    return f"{stem}.{extension}"
+
+
+async def _async_expand_sources(hass: HomeAssistant, sources: list[str], pattern: str | None) -> list[str]:
+    """Return the listed image sources followed by the local files matching a glob pattern."""
+    if pattern:
+        sources = [*sources, *await hass.async_add_executor_job(
+            lambda: sorted(glob.glob(resolve_local_path(hass, pattern)))
+        )]
+    return sources
+
+
+def _is_gif(source: str) -> bool:
+    return source.split("?", 1)[0].lower().endswith(".gif")
+
+
+def _unique_filenames(sources: list[str]) -> list[str]:
+    """Derive unique device filenames from image sources, in source order."""
+    filenames: list[str] = []
+    for source in sources:
+        filename = _source_filename(source, "gif" if _is_gif(source) else "jpg")
+        stem, extension = filename.rsplit(".", 1)
+        index = 2
+        while filename in filenames:
+            filename = f"{stem}_{index}.{extension}"
+            index += 1
+        filenames.append(filename)
+    return filenames
+
+
+def _max_source_bytes(call: ServiceCall) -> int:
+    """Return the size cap (bytes) of images read by a service call."""
+    max_source_size = call.data.get("max_source_size")
+    return int(max_source_size * 1024 * 1024) if max_source_size else MAX_SOURCE_BYTES
+
+
+def _prepare_sources(
+    hass: HomeAssistant,
+    session: aiohttp.ClientSession,
+    image_cache: ImageCache,
+    sources: list[str],
+    resize_mode: str,
+    quality: int | None,
+    max_bytes: int | None,
+    max_source_bytes: int = MAX_SOURCE_BYTES,
+) -> list[asyncio.Task[bytes]]:
+    """Start preparing images for the display, PREPROCESS_PARALLEL at a time.
+
+    GIFs stay animated. The caller awaits the tasks in order and cancels them when done.
+    """
+    semaphore = asyncio.Semaphore(PREPROCESS_PARALLEL)
+
+    async def _prepare(source: str) -> bytes:
+        async with semaphore:
+            if _is_gif(source):
+                return await async_prepare_image(
+                    hass, session, image_cache, source,
+                    partial(prepare_animation, resize_mode=resize_mode, size=DISPLAY_SIZE,
+                            max_frames=DEFAULT_MAX_FRAMES, max_bytes=max_bytes),
+                    ("gif", resize_mode, DISPLAY_SIZE, DEFAULT_MAX_FRAMES, max_bytes),
+                    max_source_bytes,
+                )
+            return await async_prepare_image(
+                hass, session, image_cache, source,
+                partial(resize_image, resize_mode=resize_mode, size=DISPLAY_SIZE, quality=quality,
+                        max_bytes=max_bytes),
+                ("jpeg", resize_mode, DISPLAY_SIZE, quality, max_bytes),
+                max_source_bytes,
+            )
+
+    return [asyncio.create_task(_prepare(source)) for source in sources]
+
+
+async def _async_stop_playback(coordinator: GeekMagicDataUpdateCoordinator) -> None:
+    """Stop a running slideshow or sequence, which a sent image replaces."""
+    if coordinator.slideshow.running:
+        await coordinator.slideshow.async_stop()
+    if coordinator.sequence.running:
+        await coordinator.sequence.async_stop()
+
+
+def _sequence_frames(html: str, frames: list[Any], interval: float, start: float) -> list[Frame]:
+    """Fill the HTML template for every frame and work out when each is due.
+
+    A frame is a mapping of ``$name`` placeholder values, with an optional ``at``
+    time, or a single value for ``$value``. Frames without ``at`` follow the
+    previous one after ``interval`` seconds.
+    """
+    result: list[Frame] = []
+    due = start
+    for frame in frames:
+        values = dict(frame) if isinstance(frame, dict) else {"value": frame}
+        if (at := values.pop("at", None)) is not None:
+            try:
+                due = float(at) if isinstance(at, (int, float)) else dt_util.as_timestamp(at)
+            except ValueError as e:
+                raise HomeAssistantError(f"Invalid frame time {at!r}") from e
+        result.append(Frame(Template(html).safe_substitute({key: str(value) for key, value in values.items()}), due))
+        due += interval
+
+    result.sort(key=lambda frame: frame.due)
+    return result
+
+
+async def _async_render_html(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    html: str,
+    cache: bool,
+    cache_ttl: int | None,
+    quality: int | None,
+    max_bytes: int | None,
+) -> bytes:
+    """Render HTML on the entry's render services and encode it for the display."""
+    render_urls = parse_render_urls(entry.options.get(CONF_RENDER_URL))
+    if not render_urls:
+        raise HomeAssistantError("Render URL not configured for Geek Magic device")
+    render_client: RenderClient = hass.data[DATA_RENDER_CLIENT]
+
+    async def _render() -> bytes:
+        return await render_client.async_render(render_urls, html, cache)
+
+    if cache:
+        image_data = await hass.data[DATA_RENDER_CACHE].async_get_or_render(html, _render, cache_ttl)
+    else:
+        image_data = await _render()
+
+    try:
+        return await hass.async_add_executor_job(reencode_jpeg, image_data, quality, max_bytes)
+    except Exception as e:
+        raise HomeAssistantError(f"Error encoding rendered image: {e}") from e
+
+
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Geek Magic from a config entry."""
     hass.data.setdefault(DOMAIN, {})
@@ -63,20 +293,30 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     url = f"http://{entry.data[CONF_IP_ADDRESS]}"
 
     session = async_get_clientsession(hass)
-    client = GeekMagicApiClient(session, url)
+    client = GeekMagicApiClient(url)
+
+    # Rendered images are shared by all devices
+    if DATA_RENDER_CACHE not in hass.data:
+        hass.data[DATA_RENDER_CACHE] = RenderCache(
+            hass, hass.config.path(CACHE_DIR, "render"), RENDER_CACHE_MAX_BYTES
+        )
+    if DATA_RENDER_CLIENT not in hass.data:
+        hass.data[DATA_RENDER_CLIENT] = RenderClient(session)
+    if DATA_IMAGE_CACHE not in hass.data:
+        hass.data[DATA_IMAGE_CACHE] = ImageCache(IMAGE_CACHE_MAX_BYTES)
+    image_cache: ImageCache = hass.data[DATA_IMAGE_CACHE]
 
     # Get update interval from options or use default
     update_interval = entry.options.get(CONF_UPDATE_INTERVAL, DEFAULT_UPDATE_INTERVAL)
     coordinator = GeekMagicDataUpdateCoordinator(hass, client, entry, update_interval)
 
-    await coordinator.async_config_entry_first_refresh()
+    # Start from the last known state; the device is first polled in the background
+    await coordinator.assets.async_load()
+    await coordinator.slideshow.async_load()
+    await coordinator.async_restore_state()
 
     hass.data[DOMAIN][entry.entry_id] = coordinator
 
-    # Check for supported firmware
-    model = coordinator.data.get("m")
-    is_aydarik = isinstance(model, str) and model == "aydarik"
-
     # Register services in `async_setup_entry` but check if they are already registered.
     if not hass.services.has_service(DOMAIN, "send_html"):
         async def handle_send_html(call):
@@ -85,51 +325,66 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
             text = call.data.get("text", "")
             html = call.data.get("html")
             filename = call.data.get("filename", "geekmagic")
+            deduplicate = call.data.get("deduplicate", False)
+            double_buffer = call.data.get("double_buffer", False)
+            min_interval = call.data.get("min_interval")
             cache = call.data.get("cache", True)
+            cache_ttl = call.data.get("cache_ttl")
+            quality = call.data.get("quality")
+            max_file_size = call.data.get("max_file_size")
+            max_bytes = int(max_file_size * 1024) if max_file_size else None
+            renderer = call.data.get("renderer", "auto")
             timeout = call.data.get("timeout")
 
+            if not html and not subject and not text:
+                raise HomeAssistantError("No html, subject, or text provided")
+
             coordinators = await _async_get_coordinators_by_device_id(hass, device_ids)
             if not coordinators:
-                return
+                return {"devices": {}}
 
-            for coordinator in coordinators:
+            async def _deliver(coordinator: GeekMagicDataUpdateCoordinator) -> dict[str, Any]:
                 config_entry_obj = coordinator.config_entry
-                render_url = config_entry_obj.options.get(CONF_RENDER_URL)
-                if not render_url:
-                    raise HomeAssistantError("Render URL not configured for Geek Magic device")
-
-                if not html:
-                    if not subject and not text:
-                        raise HomeAssistantError("No html, subject, or text provided")
-
-                    # Use template
-                    html_template = config_entry_obj.options.get(CONF_HTML_TEMPLATE, DEFAULT_HTML_TEMPLATE)
-                    html_content = html_template.replace("subject", str(subject)).replace("text", str(text))
+                html_template = config_entry_obj.options.get(CONF_HTML_TEMPLATE, DEFAULT_HTML_TEMPLATE)
+
+                # Plain subject/text in the default template is drawn in-process, without the render service
+                local = not html and can_render_locally(html_template, str(subject), str(text))
+                if renderer == "local" and not local:
+                    raise HomeAssistantError(
+                        "The local renderer supports only plain subject and text with the default template, "
+                        "in a script covered by an installed font"
+                    )
+
+                if local and renderer != "remote":
+                    image_data = await hass.async_add_executor_job(
+                        render_text, str(subject), str(text), quality, max_bytes
+                    )
                 else:
-                    html_content = html
+                    if not html:
+                        # Use template
+                        html_content = html_template.replace("subject", str(subject)).replace("text", str(text))
+                    else:
+                        html_content = html
+                    image_data = await _async_render_html(
+                        hass, config_entry_obj, html_content, cache, cache_ttl, quality, max_bytes
+                    )
 
-                # Render HTML
-                try:
-                    async with session.post(
-                            render_url,
-                            json={"html": html_content, "cache": "true" if cache else "false"},
-                            headers={"Content-Type": "application/json"}
-                    ) as resp:
-                        if resp.status != 200:
-                            _LOGGER.error("Error rendering HTML for device: %s", await resp.text())
-                            continue
-                        image_data = await resp.read()
-                except Exception as e:
-                    _LOGGER.error("Error connecting to render service: %s", e)
-                    continue
+                device_filename, uploaded = await coordinator.assets.async_upload(
+                    image_data, f"{filename}.jpg", deduplicate, double_buffer=double_buffer
+                )
+                await _async_stop_playback(coordinator)
+                await coordinator.client.async_set_image(device_filename, timeout, not coordinator.data.is_aydarik)
+                coordinator.assets.async_shown(device_filename)
+                return {"filename": device_filename, "uploaded": uploaded, "bytes": len(image_data)}
 
-                try:
-                    await coordinator.client.async_upload_file(image_data, f"{filename}.jpg")
-                    await coordinator.client.async_set_image(f"{filename}.jpg", timeout, not is_aydarik)
-                except Exception as e:
-                    _LOGGER.error("Error uploading image to device: %s", e)
+            async def _send(coordinator: GeekMagicDataUpdateCoordinator) -> dict[str, Any]:
+                # Rendering is part of the delivery, so dropped calls don't render
+                return await coordinator.throttle.async_run(min_interval, partial(_deliver, coordinator))
+
+            return await _async_broadcast(hass, call, coordinators, _send, "sending HTML")
 
-        hass.services.async_register(DOMAIN, "send_html", handle_send_html)
+        hass.services.async_register(DOMAIN, "send_html", handle_send_html,
+                                     supports_response=SupportsResponse.OPTIONAL)
 
     if not hass.services.has_service(DOMAIN, "send_image"):
         async def handle_send_image(call):
@@ -137,120 +392,354 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
             image_path = call.data.get("image_path")
             resize_mode = call.data.get("resize_mode", "stretch")
             filename = call.data.get("filename", "geekmagic")
+            deduplicate = call.data.get("deduplicate", False)
+            double_buffer = call.data.get("double_buffer", False)
+            min_interval = call.data.get("min_interval")
+            quality = call.data.get("quality")
+            max_file_size = call.data.get("max_file_size")
             timeout = call.data.get("timeout")
 
+            if not image_path:
+                raise HomeAssistantError("No image path provided")
+
             coordinators = await _async_get_coordinators_by_device_id(hass, device_ids)
             if not coordinators:
-                return
+                return {"devices": {}}
+
+            max_bytes = int(max_file_size * 1024) if max_file_size else None
+            prepare_lock = asyncio.Lock()
+            prepared: bytes | None = None
+
+            # Prepared once for all devices
+            async def _prepare() -> bytes:
+                nonlocal prepared
+                async with prepare_lock:
+                    if prepared is None:
+                        prepared = await async_prepare_image(
+                            hass, session, image_cache, image_path,
+                            partial(resize_image, resize_mode=resize_mode, size=DISPLAY_SIZE, quality=quality,
+                                    max_bytes=max_bytes),
+                            ("jpeg", resize_mode, DISPLAY_SIZE, quality, max_bytes),
+                            _max_source_bytes(call),
+                        )
+                return prepared
+
+            # Throttled calls prepare the image only when delivered; otherwise errors fail the whole call
+            if not min_interval:
+                await _prepare()
+
+            async def _deliver(coordinator: GeekMagicDataUpdateCoordinator) -> dict[str, Any]:
+                resized_image_data = await _prepare()
+                device_filename, uploaded = await coordinator.assets.async_upload(
+                    resized_image_data, f"{filename}.jpg", deduplicate, double_buffer=double_buffer
+                )
+                await _async_stop_playback(coordinator)
+                await coordinator.client.async_set_image(device_filename, timeout, not coordinator.data.is_aydarik)
+                coordinator.assets.async_shown(device_filename)
+                return {"filename": device_filename, "uploaded": uploaded, "bytes": len(resized_image_data)}
+
+            async def _send(coordinator: GeekMagicDataUpdateCoordinator) -> dict[str, Any]:
+                return await coordinator.throttle.async_run(min_interval, partial(_deliver, coordinator))
+
+            return await _async_broadcast(hass, call, coordinators, _send, "uploading image")
+
+        hass.services.async_register(DOMAIN, "send_image", handle_send_image,
+                                     supports_response=SupportsResponse.OPTIONAL)
+
+    if not hass.services.has_service(DOMAIN, "send_gif"):
+        async def handle_send_gif(call):
+            device_ids = call.data.get("device_id")
+            image_path = call.data.get("image_path")
+            target = call.data.get("target", "album")
+            resize_mode = call.data.get("resize_mode", "stretch")
+            filename = call.data.get("filename", "geekmagic")
+            max_frames = int(call.data.get("max_frames", DEFAULT_MAX_FRAMES))
+            max_file_size = call.data.get("max_file_size")
+            timeout = call.data.get("timeout")
 
             if not image_path:
                 raise HomeAssistantError("No image path provided")
 
-            # Fetch image data
-            image_data = None
-            if image_path.startswith("http"):
-                try:
-                    async with session.get(image_path) as resp:
-                        if resp.status != 200:
-                            _LOGGER.error("Error fetching image from URL: %s", resp.status)
-                            return
-                        image_data = await resp.read()
-                except Exception as e:
-                    _LOGGER.error("Error connecting to image URL: %s", e)
-                    return
-            else:
-                # Local file
+            coordinators = await _async_get_coordinators_by_device_id(hass, device_ids)
+            if target == "small":
+                # Only the factory firmware has the small (weather) image slot
+                supported = [coordinator for coordinator in coordinators if not coordinator.data.is_aydarik]
+                if coordinators and not supported:
+                    raise HomeAssistantError("The small image slot is supported by the factory firmware only")
+                for coordinator in coordinators:
+                    if coordinator not in supported:
+                        _LOGGER.warning("Skipping %s, the aydarik firmware has no small image slot",
+                                        coordinator.client.url)
+                coordinators = supported
+            if not coordinators:
+                return {"devices": {}}
+
+            size = SMALL_IMAGE_SIZE if target == "small" else DISPLAY_SIZE
+            max_bytes = int(max_file_size * 1024) if max_file_size else None
+            gif_data = await async_prepare_image(
+                hass, session, image_cache, image_path,
+                partial(prepare_animation, resize_mode=resize_mode, size=size, max_frames=max_frames,
+                        max_bytes=max_bytes),
+                ("gif", resize_mode, size, max_frames, max_bytes),
+                _max_source_bytes(call),
+            )
+
+            async def _send(coordinator: GeekMagicDataUpdateCoordinator) -> dict[str, Any]:
+                if target == "small":
+                    device_filename, uploaded = await coordinator.assets.async_upload(
+                        gif_data, f"{filename}.gif", directory="/gif/"
+                    )
+                    await coordinator.client.async_set_small_image(device_filename)
+                    coordinator.assets.async_touch(device_filename, "/gif/")
+                else:
+                    device_filename, uploaded = await coordinator.assets.async_upload(gif_data, f"{filename}.gif")
+                    await _async_stop_playback(coordinator)
+                    await coordinator.client.async_set_image(device_filename, timeout, not coordinator.data.is_aydarik)
+                    coordinator.assets.async_shown(device_filename)
+                return {"filename": device_filename, "uploaded": uploaded, "bytes": len(gif_data)}
+
+            return await _async_broadcast(hass, call, coordinators, _send, "uploading GIF")
+
+        hass.services.async_register(DOMAIN, "send_gif", handle_send_gif,
+                                     supports_response=SupportsResponse.OPTIONAL)
+
+    if not hass.services.has_service(DOMAIN, "upload_images"):
+        async def handle_upload_images(call):
+            device_ids = call.data.get("device_id")
+            sources = list(call.data.get("images") or [])
+            pattern = call.data.get("glob")
+            resize_mode = call.data.get("resize_mode", "stretch")
+            quality = call.data.get("quality")
+            max_file_size = call.data.get("max_file_size")
+            max_bytes = int(max_file_size * 1024) if max_file_size else None
+
+            sources = await _async_expand_sources(hass, sources, pattern)
+            if not sources:
+                raise HomeAssistantError("No images provided")
+
+            coordinators = await _async_get_coordinators_by_device_id(hass, device_ids)
+            if not coordinators:
+                return {"devices": {}}
+
+            filenames = _unique_filenames(sources)
+
+            # Preprocess in parallel; every device uploads in order as soon as each file is ready
+            prepared = _prepare_sources(hass, session, image_cache, sources, resize_mode, quality, max_bytes,
+                                        _max_source_bytes(call))
+
+            async def _upload(coordinator: GeekMagicDataUpdateCoordinator) -> dict[str, Any]:
+                device_id = _device_id(hass, coordinator)
+                files: list[dict[str, Any]] = []
                 try:
-                    actual_path = image_path
-                    if image_path.startswith("/config/"):
-                        actual_path = hass.config.path(image_path[8:])
+                    for index, (source, filename, task) in enumerate(zip(sources, filenames, prepared)):
+                        result: dict[str, Any] = {"source": source, "filename": filename}
+                        try:
+                            data = await task
+                            _, result["uploaded"] = await coordinator.assets.async_upload(data, filename)
+                            result["bytes"] = len(data)
+                        except Exception as e:  # pylint: disable=broad-except
+                            _LOGGER.error("Error uploading %s to %s: %s", source, coordinator.client.url, e)
+                            result["error"] = str(e)
+                        files.append(result)
+
+                        hass.bus.async_fire(f"{DOMAIN}_upload_progress", {
+                            "device_id": device_id,
+                            "done": index + 1,
+                            "total": len(sources),
+                            **result,
+                        })
+                finally:
+                    # One inventory refresh for the whole batch
+                    await coordinator.async_request_refresh()
+
+                return {"files": files, "failed": sum(1 for file in files if "error" in file)}
 
-                    def _read_file():
-                        with open(actual_path, "rb") as f:
-                            return f.read()
+            try:
+                return await _async_broadcast(hass, call, coordinators, _upload, "uploading images")
+            finally:
+                for task in prepared:
+                    task.cancel()
 
-                    image_data = await hass.async_add_executor_job(_read_file)
-                except Exception as e:
-                    _LOGGER.error("Error reading local image file: %s", e)
-                    return
+        hass.services.async_register(DOMAIN, "upload_images", handle_upload_images,
+                                     supports_response=SupportsResponse.OPTIONAL)
 
-            if not image_data:
-                return
+    if not hass.services.has_service(DOMAIN, "start_slideshow"):
+        async def handle_start_slideshow(call):
+            device_ids = call.data.get("device_id")
+            sources = list(call.data.get("images") or [])
+            pattern = call.data.get("glob")
+            duration = float(call.data.get("duration", DEFAULT_SLIDE_DURATION))
+            durations = list(call.data.get("durations") or [])
+            shuffle = call.data.get("shuffle", False)
+            resize_mode = call.data.get("resize_mode", "stretch")
+            quality = call.data.get("quality")
+            max_file_size = call.data.get("max_file_size")
+            max_bytes = int(max_file_size * 1024) if max_file_size else None
 
-            # Resize image
+            sources = await _async_expand_sources(hass, sources, pattern)
+            if not sources:
+                raise HomeAssistantError("No images provided")
+
+            # Per-slide durations, the default for any slide not listed
             try:
-                def _resize_image():
-                    import io
-                    from PIL import Image
-                    img = Image.open(io.BytesIO(image_data))
-                    if img.mode != "RGB":
-                        img = img.convert("RGB")
-
-                    if resize_mode == "stretch":
-                        img = img.resize((240, 240), Image.Resampling.LANCZOS)
-                    elif resize_mode == "crop":
-                        # Crop: fill 240x240 and take center
-                        width, height = img.size
-                        ratio = max(240 / width, 240 / height)
-                        new_width = int(width * ratio)
-                        new_height = int(height * ratio)
-                        img = img.resize((new_width, new_height), Image.Resampling.LANCZOS)
-
-                        left = (new_width - 240) / 2
-                        top = (new_height - 240) / 2
-                        right = (new_width + 240) / 2
-                        bottom = (new_height + 240) / 2
-                        img = img.crop((left, top, right, bottom))
-                    else:
-                        # fit / contain: longest side 240
-                        width, height = img.size
-                        if width > height:
-                            new_width = 240
-                            new_height = int(height * (240 / width))
-                        else:
-                            new_height = 240
-                            new_width = int(width * (240 / height))
-                        img = img.resize((new_width, new_height), Image.Resampling.LANCZOS)
-
-                    output = io.BytesIO()
-                    img.save(output, format="JPEG")
-                    return output.getvalue()
-
-                resized_image_data = await hass.async_add_executor_job(_resize_image)
-            except Exception as e:
-                _LOGGER.error("Error resizing image: %s", e)
-                return
-
-            for coordinator in coordinators:
+                durations = [float(value) for value in durations]
+            except (TypeError, ValueError) as e:
+                raise HomeAssistantError(f"Invalid slide duration: {e}") from e
+            durations = [max(MIN_SLIDE_DURATION, value) for value in durations[:len(sources)]]
+            durations += [max(MIN_SLIDE_DURATION, duration)] * (len(sources) - len(durations))
+
+            coordinators = await _async_get_coordinators_by_device_id(hass, device_ids)
+            if not coordinators:
+                return {"devices": {}}
+
+            prepared = _prepare_sources(hass, session, image_cache, sources, resize_mode, quality, max_bytes,
+                                        _max_source_bytes(call))
+            try:
+                images = await asyncio.gather(*prepared)
+            finally:
+                for task in prepared:
+                    task.cancel()
+
+            slides = [
+                (data, "gif" if _is_gif(source) else "jpg", slide_duration)
+                for source, data, slide_duration in zip(sources, images, durations)
+            ]
+
+            async def _start(coordinator: GeekMagicDataUpdateCoordinator) -> dict[str, Any]:
                 try:
-                    await coordinator.client.async_upload_file(resized_image_data, f"{filename}.jpg")
-                    await coordinator.client.async_set_image(f"{filename}.jpg", timeout, not is_aydarik)
-                except Exception as e:
-                    _LOGGER.error("Error uploading image: %s", e)
+                    if coordinator.sequence.running:
+                        await coordinator.sequence.async_stop()
+                    return await coordinator.slideshow.async_set_playlist(slides, shuffle)
+                finally:
+                    await coordinator.async_request_refresh()
+
+            return await _async_broadcast(hass, call, coordinators, _start, "starting slideshow")
 
-        hass.services.async_register(DOMAIN, "send_image", handle_send_image)
+        hass.services.async_register(DOMAIN, "start_slideshow", handle_start_slideshow,
+                                     supports_response=SupportsResponse.OPTIONAL)
+
+    if not hass.services.has_service(DOMAIN, "stop_slideshow"):
+        async def handle_stop_slideshow(call):
+            device_ids = call.data.get("device_id")
+            clear = call.data.get("clear", False)
+
+            coordinators = await _async_get_coordinators_by_device_id(hass, device_ids)
+            if not coordinators:
+                return {"devices": {}}
+
+            async def _stop(coordinator: GeekMagicDataUpdateCoordinator) -> dict[str, Any]:
+                return await coordinator.slideshow.async_stop(clear)
+
+            return await _async_broadcast(hass, call, coordinators, _stop, "stopping slideshow")
+
+        hass.services.async_register(DOMAIN, "stop_slideshow", handle_stop_slideshow,
+                                     supports_response=SupportsResponse.OPTIONAL)
+
+    if not hass.services.has_service(DOMAIN, "play_sequence"):
+        async def handle_play_sequence(call):
+            device_ids = call.data.get("device_id")
+            html = call.data.get("html")
+            frames = call.data.get("frames")
+            interval = float(call.data.get("interval", DEFAULT_SEQUENCE_INTERVAL))
+            start = call.data.get("start")
+            filename = call.data.get("filename", "sequence")
+            lookahead = int(call.data.get("lookahead", DEFAULT_SEQUENCE_LOOKAHEAD))
+            cache = call.data.get("cache", True)
+            quality = call.data.get("quality")
+            max_file_size = call.data.get("max_file_size")
+            max_bytes = int(max_file_size * 1024) if max_file_size else None
+
+            if not html:
+                raise HomeAssistantError("No html provided")
+            if not isinstance(frames, list) or not frames:
+                raise HomeAssistantError("No frames provided")
+            lookahead = max(1, min(MAX_SEQUENCE_LOOKAHEAD, lookahead))
+            try:
+                start_time = dt_util.as_timestamp(start) if start else time.time()
+            except ValueError as e:
+                raise HomeAssistantError(f"Invalid start time {start!r}") from e
+            sequence = _sequence_frames(html, frames, max(MIN_SLIDE_DURATION, interval), start_time)
+
+            coordinators = await _async_get_coordinators_by_device_id(hass, device_ids)
+            if not coordinators:
+                return {"devices": {}}
+
+            async def _play(coordinator: GeekMagicDataUpdateCoordinator) -> dict[str, Any]:
+                if coordinator.slideshow.running:
+                    await coordinator.slideshow.async_stop()
+                render = partial(_async_render_html, hass, coordinator.config_entry,
+                                 cache=cache, cache_ttl=None, quality=quality, max_bytes=max_bytes)
+                return await coordinator.sequence.async_play(sequence, render, filename, lookahead)
+
+            return await _async_broadcast(hass, call, coordinators, _play, "starting sequence")
+
+        hass.services.async_register(DOMAIN, "play_sequence", handle_play_sequence,
+                                     supports_response=SupportsResponse.OPTIONAL)
+
+    if not hass.services.has_service(DOMAIN, "stop_sequence"):
+        async def handle_stop_sequence(call):
+            device_ids = call.data.get("device_id")
+            clear = call.data.get("clear", False)
+
+            coordinators = await _async_get_coordinators_by_device_id(hass, device_ids)
+            if not coordinators:
+                return {"devices": {}}
+
+            async def _stop(coordinator: GeekMagicDataUpdateCoordinator) -> dict[str, Any]:
+                return await coordinator.sequence.async_stop(clear)
+
+            return await _async_broadcast(hass, call, coordinators, _stop, "stopping sequence")
+
+        hass.services.async_register(DOMAIN, "stop_sequence", handle_stop_sequence,
+                                     supports_response=SupportsResponse.OPTIONAL)
 
     if not hass.services.has_service(DOMAIN, "delete_image"):
         async def handle_delete_image(call):
             device_ids = call.data.get("device_id")
             filename = call.data.get("filename")
 
+            if not filename:
+                raise HomeAssistantError("No filename provided")
+            filename = _image_filename(filename)
+
             coordinators = await _async_get_coordinators_by_device_id(hass, device_ids)
             if not coordinators:
-                return
+                return {"devices": {}}
+
+            async def _delete(coordinator: GeekMagicDataUpdateCoordinator) -> None:
+                await coordinator.client.async_delete_image(filename)
+                coordinator.assets.async_forget(filename)
+
+            return await _async_broadcast(hass, call, coordinators, _delete, "deleting image")
+
+        hass.services.async_register(DOMAIN, "delete_image", handle_delete_image,
+                                     supports_response=SupportsResponse.OPTIONAL)
+
+    if not hass.services.has_service(DOMAIN, "pin_image"):
+        async def handle_pin_image(call):
+            device_ids = call.data.get("device_id")
+            filename = call.data.get("filename")
+            pinned = call.data.get("pinned", True)
 
             if not filename:
                 raise HomeAssistantError("No filename provided")
+            filename = _image_filename(filename)
 
-            for coordinator in coordinators:
-                try:
-                    await coordinator.client.async_delete_image(f"{filename}.jpg")
-                except Exception as e:
-                    _LOGGER.error("Error deleting image: %s", e)
+            coordinators = await _async_get_coordinators_by_device_id(hass, device_ids)
+            if not coordinators:
+                return {"devices": {}}
+
+            async def _pin(coordinator: GeekMagicDataUpdateCoordinator) -> dict[str, Any]:
+                if not any(coordinator.assets.async_pin(filename, pinned, directory) for directory in INVENTORY_KEYS):
+                    raise HomeAssistantError(f"{filename} was not uploaded by this integration")
+                return {"pinned": pinned}
 
-        hass.services.async_register(DOMAIN, "delete_image", handle_delete_image)
+            return await _async_broadcast(hass, call, coordinators, _pin, "pinning image")
 
-    if is_aydarik and not hass.services.has_service(DOMAIN, "send_message"):
+        hass.services.async_register(DOMAIN, "pin_image", handle_pin_image,
+                                     supports_response=SupportsResponse.OPTIONAL)
+
+    if not hass.services.has_service(DOMAIN, "send_message"):
         async def handle_send_message(call):
             device_ids = call.data.get("device_id")
             custom_message = call.data.get("custom_message")
@@ -262,20 +751,19 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
                 raise HomeAssistantError("No message provided")
 
             coordinators = await _async_get_coordinators_by_device_id(hass, device_ids)
+            coordinators = _aydarik_coordinators(coordinators)
             if not coordinators:
-                return
+                return {"devices": {}}
 
-            for coordinator in coordinators:
-                if coordinator.data.get("m") != "aydarik":
-                    continue
-                try:
-                    await coordinator.client.async_set_message(custom_message, message_subject, message_style, timeout)
-                except Exception as e:
-                    _LOGGER.error("Error sending custom message to device: %s", e)
+            async def _send(coordinator: GeekMagicDataUpdateCoordinator) -> None:
+                await coordinator.client.async_set_message(custom_message, message_subject, message_style, timeout)
 
-        hass.services.async_register(DOMAIN, "send_message", handle_send_message)
+            return await _async_broadcast(hass, call, coordinators, _send, "sending custom message")
 
-    if is_aydarik and not hass.services.has_service(DOMAIN, "set_countdown"):
+        hass.services.async_register(DOMAIN, "send_message", handle_send_message,
+                                     supports_response=SupportsResponse.OPTIONAL)
+
+    if not hass.services.has_service(DOMAIN, "set_countdown"):
         async def handle_set_countdown(call):
             device_ids = call.data.get("device_id")
             countdown_datetime = call.data.get("countdown_datetime")
@@ -286,20 +774,19 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
                 raise HomeAssistantError("No date-time provided for countdown")
 
             coordinators = await _async_get_coordinators_by_device_id(hass, device_ids)
+            coordinators = _aydarik_coordinators(coordinators)
             if not coordinators:
-                return
+                return {"devices": {}}
 
-            for coordinator in coordinators:
-                if coordinator.data.get("m") != "aydarik":
-                    continue
-                try:
-                    await coordinator.client.async_set_countdown(countdown_datetime, countdown_subject, timeout)
-                except Exception as e:
-                    _LOGGER.error("Error starting countdown timer on device: %s", e)
+            async def _send(coordinator: GeekMagicDataUpdateCoordinator) -> None:
+                await coordinator.client.async_set_countdown(countdown_datetime, countdown_subject, timeout)
 
-        hass.services.async_register(DOMAIN, "set_countdown", handle_set_countdown)
+            return await _async_broadcast(hass, call, coordinators, _send, "starting countdown timer")
 
-    if is_aydarik and not hass.services.has_service(DOMAIN, "set_note"):
+        hass.services.async_register(DOMAIN, "set_countdown", handle_set_countdown,
+                                     supports_response=SupportsResponse.OPTIONAL)
+
+    if not hass.services.has_service(DOMAIN, "set_note"):
         async def handle_set_note(call):
             device_ids = call.data.get("device_id")
             note = call.data.get("note")
@@ -311,27 +798,48 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
                 raise HomeAssistantError("No note provided")
 
             coordinators = await _async_get_coordinators_by_device_id(hass, device_ids)
+            coordinators = _aydarik_coordinators(coordinators)
             if not coordinators:
-                return
+                return {"devices": {}}
 
-            for coordinator in coordinators:
-                if coordinator.data.get("m") != "aydarik":
-                    continue
-                try:
-                    await coordinator.client.async_set_note(note, rpm, force, timeout)
-                except Exception as e:
-                    _LOGGER.error("Error setting note on device: %s", e)
+            async def _send(coordinator: GeekMagicDataUpdateCoordinator) -> None:
+                await coordinator.client.async_set_note(note, rpm, force, timeout)
 
-        hass.services.async_register(DOMAIN, "set_note", handle_set_note)
+            return await _async_broadcast(hass, call, coordinators, _send, "setting note")
+
+        hass.services.async_register(DOMAIN, "set_note", handle_set_note,
+                                     supports_response=SupportsResponse.OPTIONAL)
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
+    # Offline or slow devices must not hold up Home Assistant startup
+    entry.async_create_background_task(hass, _async_first_refresh(coordinator), f"{DOMAIN} first refresh {url}")
+
     return True
 
 
+async def _async_first_refresh(coordinator: GeekMagicDataUpdateCoordinator) -> None:
+    """Poll the device for the first time, then resume its slideshow."""
+    await coordinator.async_refresh()
+    await coordinator.slideshow.async_resume()
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     if unload_ok := await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
-        hass.data[DOMAIN].pop(entry.entry_id)
+        coordinator = hass.data[DOMAIN].pop(entry.entry_id)
+        # Write pending changes now, so no delayed write outlives the entry; the slideshow is still running
+        await coordinator.async_save_state()
+        await coordinator.assets.async_save()
+        await coordinator.slideshow.async_save()
+        await coordinator.slideshow.async_shutdown()
+        await coordinator.sequence.async_shutdown()
+        await coordinator.client.async_close()
 
     return unload_ok
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove the data stored for a deleted config entry."""
+    for name in ENTRY_STORES:
+        await Store(hass, 1, f"{DOMAIN}.{entry.entry_id}.{name}").async_remove()
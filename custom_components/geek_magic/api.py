@@ -1,39 +1,369 @@
 """API Client for Geek Magic."""
 import asyncio
+import heapq
+import itertools
+import json
 import logging
 import re
-import socket
+import time
+import uuid
+from collections.abc import Awaitable, Callable
+from typing import Any
+from urllib.parse import urlencode, urlsplit
 
-import aiohttp
 import async_timeout
 
+from .metrics import ClientMetrics
+
 _LOGGER = logging.getLogger(__name__)
 
+# Idle keep-alive connections older than this are not reused; the firmware drops them on its own
+KEEPALIVE_IDLE_TIMEOUT = 5
+# The firmware serves two connections at once; more overlapping requests make it drop some
+MAX_CONNECTIONS = 2
+# Liveness probes only open a connection, which an awake device accepts at once
+PROBE_TIMEOUT = 3
+
+# Command priorities, lower runs first
+PRIORITY_USER = 0
+PRIORITY_BACKGROUND = 1
+# One request per connection, so concurrent polls overlap and queued commands start as soon as one is free
+MAX_IN_FLIGHT = MAX_CONNECTIONS
+
+
+class GeekMagicTransportError(Exception):
+    """The device sent a response that could not be parsed."""
+
+
+class GeekMagicTransport:
+    """Lenient asyncio HTTP/1.1 client for a single Geek Magic device.
+
+    The firmware sends duplicate Content-Length headers, which aiohttp rejects,
+    so responses are parsed here. Connections are kept open and reused while the
+    firmware allows it.
+    """
+
+    def __init__(self, url: str, max_connections: int = MAX_CONNECTIONS) -> None:
+        """Initialize the transport."""
+        parts = urlsplit(url if "://" in url else f"http://{url}")
+        self._host = parts.hostname or ""
+        self._port = parts.port or 80
+        self._host_header = parts.netloc
+        self._semaphore = asyncio.Semaphore(max_connections)
+        self._idle: list[tuple[asyncio.StreamReader, asyncio.StreamWriter, float]] = []
+
+    async def request(self, method: str, path: str, params: dict | None = None, body: bytes = b"",
+                      content_type: str | None = None, timeout: float = 10, attempts: int = 1,
+                      on_retry: Callable[[BaseException], None] | None = None) -> tuple[int, bytes]:
+        """Send a request and return the status code and body."""
+        target = f"/{path.lstrip('/')}"
+        if params:
+            target = f"{target}?{urlencode(params)}"
+
+        for attempt in range(attempts):
+            try:
+                async with self._semaphore:
+                    async with async_timeout.timeout(timeout):
+                        return await self._exchange(method.upper(), target, body, content_type)
+            except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError, GeekMagicTransportError) as err:
+                if attempt == attempts - 1:
+                    raise
+                _LOGGER.debug("Retrying %s %s after error: %s", method.upper(), target, err)
+                if on_retry is not None:
+                    on_retry(err)
+
+        raise GeekMagicTransportError(f"No attempts made for {target}")
+
+    async def async_probe(self, timeout: float = PROBE_TIMEOUT) -> None:
+        """Check that the device accepts connections, keeping the connection for the next request."""
+        async with self._semaphore:
+            async with async_timeout.timeout(timeout):
+                reader, writer, _ = await self._acquire()
+        self._idle.append((reader, writer, time.monotonic()))
+
+    async def async_close(self) -> None:
+        """Close all idle connections."""
+        idle, self._idle = self._idle, []
+        for _, writer, _ in idle:
+            writer.close()
+
+    async def _exchange(self, method: str, target: str, body: bytes,
+                        content_type: str | None) -> tuple[int, bytes]:
+        """Send one request, reusing an idle connection when possible."""
+        head = [
+            f"{method} {target} HTTP/1.1",
+            f"Host: {self._host_header}",
+            "Connection: keep-alive",
+            "Accept-Encoding: identity",
+        ]
+        if body or method == "POST":
+            head.append(f"Content-Length: {len(body)}")
+        if content_type:
+            head.append(f"Content-Type: {content_type}")
+        payload = ("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + body
+
+        while True:
+            reader, writer, reused = await self._acquire()
+            try:
+                writer.write(payload)
+                await writer.drain()
+                status, data, keep_alive = await self._read_response(reader, method)
+            except (ConnectionError, asyncio.IncompleteReadError) as err:
+                writer.close()
+                if reused:
+                    # The firmware closed the kept-alive socket; try again on a fresh one
+                    _LOGGER.debug("Stale connection to %s: %s", self._host, err)
+                    continue
+                raise
+            except BaseException:
+                writer.close()
+                raise
+
+            if keep_alive:
+                self._idle.append((reader, writer, time.monotonic()))
+            else:
+                writer.close()
+            return status, data
+
+    async def _acquire(self) -> tuple[asyncio.StreamReader, asyncio.StreamWriter, bool]:
+        """Return an idle connection that is still usable, or open a new one."""
+        now = time.monotonic()
+        while self._idle:
+            reader, writer, released = self._idle.pop()
+            if now - released < KEEPALIVE_IDLE_TIMEOUT and not reader.at_eof() and not writer.is_closing():
+                return reader, writer, True
+            writer.close()
+
+        reader, writer = await asyncio.open_connection(self._host, self._port)
+        return reader, writer, False
+
+    @staticmethod
+    async def _read_response(reader: asyncio.StreamReader, method: str) -> tuple[int, bytes, bool]:
+        """Read a response, tolerating duplicate headers."""
+        status_line = await reader.readline()
+        if not status_line:
+            raise ConnectionResetError("Connection closed before response")
+
+        try:
+            version, status_text = status_line.decode("latin-1").split(None, 2)[:2]
+            status = int(status_text)
+        except ValueError as err:
+            raise GeekMagicTransportError(f"Malformed status line: {status_line!r}") from err
+
+        headers: dict[str, list[str]] = {}
+        while True:
+            line = await reader.readline()
+            if not line:
+                raise asyncio.IncompleteReadError(b"", None)
+            if line in (b"\r\n", b"\n"):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers.setdefault(name.strip().lower(), []).append(value.strip())
+
+        connection = ",".join(headers.get("connection", [])).lower()
+        if version.upper() == "HTTP/1.0":
+            keep_alive = "keep-alive" in connection
+        else:
+            keep_alive = "close" not in connection
+
+        if method == "HEAD" or status in (204, 304) or 100 <= status < 200:
+            return status, b"", keep_alive
+
+        if "chunked" in ",".join(headers.get("transfer-encoding", [])).lower():
+            chunks = []
+            while True:
+                size_line = await reader.readline()
+                try:
+                    size = int(size_line.split(b";")[0].strip(), 16)
+                except ValueError as err:
+                    raise GeekMagicTransportError(f"Malformed chunk size: {size_line!r}") from err
+                if size == 0:
+                    # Skip trailers
+                    while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                        pass
+                    return status, b"".join(chunks), keep_alive
+                chunks.append(await reader.readexactly(size))
+                await reader.readexactly(2)
+
+        # Duplicate Content-Length headers are accepted as long as they agree
+        lengths = {
+            value.strip()
+            for header in headers.get("content-length", [])
+            for value in header.split(",")
+            if value.strip()
+        }
+        if len(lengths) > 1:
+            raise GeekMagicTransportError(f"Conflicting Content-Length headers: {sorted(lengths)}")
+        if lengths:
+            try:
+                length = int(lengths.pop())
+            except ValueError as err:
+                raise GeekMagicTransportError("Malformed Content-Length header") from err
+            return status, await reader.readexactly(length), keep_alive
+
+        # No length given: the body ends when the device closes the connection
+        return status, await reader.read(), False
+
+
+class _Command:
+    """A queued device command."""
+
+    __slots__ = ("priority", "seq", "key", "factory", "future", "waiters", "started")
+
+    def __init__(self, priority: int, seq: int, key: str | None,
+                 factory: Callable[[], Awaitable[Any]], future: asyncio.Future) -> None:
+        self.priority = priority
+        self.seq = seq
+        self.key = key
+        self.factory = factory
+        self.future = future
+        self.waiters = 0
+        self.started = False
+
+    def __lt__(self, other: "_Command") -> bool:
+        return (self.priority, self.seq) < (other.priority, other.seq)
+
+
+class GeekMagicCommandQueue:
+    """Per-device command scheduler.
+
+    Caps the number of requests in flight, runs user commands before background
+    polls and coalesces queued commands sharing a key, so only the latest value
+    is sent.
+    """
+
+    def __init__(self, max_in_flight: int = MAX_IN_FLIGHT) -> None:
+        """Initialize the queue."""
+        self._max_in_flight = max_in_flight
+        self._in_flight = 0
+        self._heap: list[_Command] = []
+        self._pending: dict[str, _Command] = {}
+        self._seq = itertools.count()
+        self._tasks: set[asyncio.Task] = set()
+
+    async def submit(self, factory: Callable[[], Awaitable[Any]], priority: int = PRIORITY_USER,
+                     key: str | None = None) -> Any:
+        """Queue a command and wait for its result."""
+        command = self._pending.get(key) if key is not None else None
+        if command is not None:
+            # Superseded: the queued command sends the latest value instead, for all callers
+            _LOGGER.debug("Coalescing queued command %s", key)
+            command.factory = factory
+            if priority < command.priority:
+                command.priority = priority
+                heapq.heapify(self._heap)
+        else:
+            command = _Command(priority, next(self._seq), key, factory, asyncio.get_running_loop().create_future())
+            heapq.heappush(self._heap, command)
+            if key is not None:
+                self._pending[key] = command
+            self._pump()
+
+        command.waiters += 1
+        try:
+            return await asyncio.shield(command.future)
+        finally:
+            command.waiters -= 1
+            if command.waiters == 0 and not command.started:
+                # Nobody is waiting any more, drop it before it reaches the device
+                self._discard(command)
+
+    def _discard(self, command: _Command) -> None:
+        """Remove a command that has not started yet."""
+        if command in self._heap:
+            self._heap.remove(command)
+            heapq.heapify(self._heap)
+        if command.key is not None and self._pending.get(command.key) is command:
+            del self._pending[command.key]
+        command.future.cancel()
+
+    def _pump(self) -> None:
+        """Start queued commands while there is capacity."""
+        while self._heap and self._in_flight < self._max_in_flight:
+            command = heapq.heappop(self._heap)
+            if command.key is not None and self._pending.get(command.key) is command:
+                del self._pending[command.key]
+            command.started = True
+            self._in_flight += 1
+            task = asyncio.create_task(self._run(command))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, command: _Command) -> None:
+        """Run a command and resolve its future."""
+        try:
+            result = await command.factory()
+        except Exception as err:  # pylint: disable=broad-except
+            command.future.set_exception(err)
+            if command.waiters == 0:
+                # Mark as retrieved, the callers are gone
+                command.future.exception()
+        else:
+            command.future.set_result(result)
+        finally:
+            self._in_flight -= 1
+            self._pump()
+
+
+def _encode_multipart(field: str, filename: str, data: bytes, content_type: str) -> tuple[bytes, str]:
+    """Encode a single file as multipart/form-data."""
+    boundary = uuid.uuid4().hex
+    body = b"".join([
+        f"--{boundary}\r\n".encode(),
+        f'Content-Disposition: form-data; name="{field}"; filename="{filename}"\r\n'.encode(),
+        f"Content-Type: {content_type}\r\n\r\n".encode(),
+        data,
+        f"\r\n--{boundary}--\r\n".encode(),
+    ])
+    return body, f"multipart/form-data; boundary={boundary}"
+
 
 class GeekMagicApiClient:
     """API Client for Geek Magic."""
 
-    def __init__(self, session: aiohttp.ClientSession, url: str) -> None:
+    def __init__(self, url: str) -> None:
         """Initialize the API client."""
-        self._session = session
         self._url = url.rstrip("/")
+        self._transport = GeekMagicTransport(self._url)
+        self._queue = GeekMagicCommandQueue()
+        self.metrics = ClientMetrics()
         self._theme = None
         self._brt = None
         self._model = None
         self._free_space = None
+        # Bumped on every upload or delete, so the coordinator knows its file lists are stale
+        self.inventory_version = 0
+
+    @property
+    def url(self) -> str:
+        """Return the device base URL."""
+        return self._url
+
+    async def async_close(self) -> None:
+        """Close connections to the device."""
+        await self._transport.async_close()
 
     async def async_get_data(self) -> dict:
         """Get data from the API."""
-        # Fetch both theme and brightness
-        theme_data = await self._api_wrapper("get", "app.json")
-        brt_data = await self._api_wrapper("get", "brt.json")
-        model_data = await self._api_wrapper("get", "v.json")
-
-        if theme_data is not None:
+        # Fetch theme, brightness and model concurrently, keeping the last known value of any that fail
+        theme_data, brt_data, model_data = results = await asyncio.gather(
+            self._api_wrapper("get", "app.json", priority=PRIORITY_BACKGROUND, key="app.json"),
+            self._api_wrapper("get", "brt.json", priority=PRIORITY_BACKGROUND, key="brt.json"),
+            self._api_wrapper("get", "v.json", priority=PRIORITY_BACKGROUND, key="v.json"),
+            return_exceptions=True,
+        )
+
+        errors = [result for result in results if isinstance(result, BaseException)]
+        if len(errors) == len(results):
+            raise errors[0]
+        for error in errors:
+            _LOGGER.debug("Partial update from %s failed: %s", self._url, error)
+
+        if isinstance(theme_data, dict):
             self._theme = theme_data.get("theme")
-        if brt_data is not None:
+        if isinstance(brt_data, dict):
             self._brt = brt_data.get("brt")
-        if model_data is not None:
+        if isinstance(model_data, dict):
             self._model = model_data.get("m")
 
         return {
@@ -42,9 +372,20 @@ class GeekMagicApiClient:
             "m": self._model,
         }
 
+    async def async_probe(self) -> None:
+        """Check cheaply that the device is reachable."""
+        metrics = self.metrics.endpoint("probe")
+        started = time.monotonic()
+        try:
+            await self._transport.async_probe()
+        except (OSError, asyncio.TimeoutError) as exception:
+            metrics.record_error(exception, timeout=isinstance(exception, asyncio.TimeoutError))
+            raise Exception(f"{self._url} is not reachable - {exception}") from exception
+        metrics.record(time.monotonic() - started, 0, 0)
+
     async def async_get_space(self) -> int | None:
         """Get free space in bytes."""
-        data = await self._api_wrapper("get", "space.json")
+        data = await self._api_wrapper("get", "space.json", priority=PRIORITY_BACKGROUND, key="space.json")
         if data is not None:
             self._free_space = data.get("free")
         return self._free_space
@@ -52,78 +393,30 @@ class GeekMagicApiClient:
     async def async_get_images(self) -> list[str]:
         """Get list of images."""
         # /filelist?dir=/image returns HTML
-        # The device sends duplicate Content-Length headers which aiohttp rejects.
-        # We use requests (via executor) as a workaround.
-        loop = asyncio.get_running_loop()
-
-        def _fetch():
-            import requests
-            for attempt in range(2):
-                try:
-                    resp = requests.get(
-                        f"{self._url}/filelist",
-                        params={"dir": "/image"},
-                        timeout=10
-                    )
-                    resp.raise_for_status()
-                    return resp.text
-                except Exception as err:
-                    if attempt == 1:
-                        raise err
-                    _LOGGER.debug("Retrying /filelist (dir=/image) after error: %s", err)
-            return ""
-
-        try:
-            html = await loop.run_in_executor(None, _fetch)
-        except Exception as err:
-            _LOGGER.error("Error fetching images: %s", err)
-            return []
+        html = await self._api_wrapper("get", "filelist", params={"dir": "/image"}, is_json=False, attempts=2,
+                                       priority=PRIORITY_BACKGROUND, key="filelist:/image")
 
         # Pattern: href='/image/1.gif' -> 1.gif
-        matches = re.findall(r"href='/image/([^']+)'", html)
+        matches = re.findall(r"href='/image/([^']+)'", html or "")
         return matches
 
     async def async_get_small_images(self) -> list[str]:
         """Get list of small (weather) images."""
         # /filelist?dir=/gif returns HTML
-        # The device sends duplicate Content-Length headers which aiohttp rejects.
-        # We use requests (via executor) as a workaround.
-        loop = asyncio.get_running_loop()
-
-        def _fetch():
-            import requests
-            for attempt in range(2):
-                try:
-                    resp = requests.get(
-                        f"{self._url}/filelist",
-                        params={"dir": "/gif"},
-                        timeout=10
-                    )
-                    resp.raise_for_status()
-                    return resp.text
-                except Exception as err:
-                    if attempt == 1:
-                        raise err
-                    _LOGGER.debug("Retrying /filelist (dir=/gif) after error: %s", err)
-            return ""
-
-        try:
-            html = await loop.run_in_executor(None, _fetch)
-        except Exception as err:
-            _LOGGER.error("Error fetching images: %s", err)
-            return []
+        html = await self._api_wrapper("get", "filelist", params={"dir": "/gif"}, is_json=False, attempts=2,
+                                       priority=PRIORITY_BACKGROUND, key="filelist:/gif")
 
         # Pattern: href='/gif/1.gif' -> 1.gif
-        matches = re.findall(r"href='/gif/([^']+)'", html)
+        matches = re.findall(r"href='/gif/([^']+)'", html or "")
         return matches
 
     async def async_set_theme(self, theme_id: int) -> None:
         """Set the theme."""
-        await self._api_wrapper("get", "set", params={"theme": theme_id}, is_json=False)
+        await self._api_wrapper("get", "set", params={"theme": theme_id}, is_json=False, key="set:theme")
 
     async def async_set_brightness(self, value: int) -> None:
         """Set the brightness."""
-        await self._api_wrapper("get", "set", params={"brt": value}, is_json=False)
+        await self._api_wrapper("get", "set", params={"brt": value}, is_json=False, key="set:brt")
 
     async def async_set_image(self, filename: str, timeout: int | None, force_switch: bool) -> None:
         """Set the image."""
@@ -132,20 +425,21 @@ class GeekMagicApiClient:
             params["timeout"] = timeout
 
         # /set?img=/image/<filename>
-        await self._api_wrapper("get", "set", params=params, is_json=False)
+        await self._api_wrapper("get", "set", params=params, is_json=False, key="set:img")
         if force_switch:
             # Switch to theme 3 (Photo Album)
             await self.async_set_theme(3)
 
-    async def async_delete_image(self, filename: str) -> None:
+    async def async_delete_image(self, filename: str, directory: str = "/image/") -> None:
         """Delete the image."""
         # /delete?file=/image/<filename>
-        await self._api_wrapper("get", "delete", params={"file": f"/image/{filename}"}, is_json=False)
+        await self._api_wrapper("get", "delete", params={"file": f"{directory}{filename}"}, is_json=False)
+        self.inventory_version += 1
 
     async def async_set_small_image(self, filename: str) -> None:
         """Set the small (weather) image."""
         # /set?img=/gif/<filename>
-        await self._api_wrapper("get", "set", params={"gif": f"/gif/{filename}"}, is_json=False)
+        await self._api_wrapper("get", "set", params={"gif": f"/gif/{filename}"}, is_json=False, key="set:gif")
 
     async def async_set_message(self, custom_message: str, subject: str, style: str, timeout: int) -> None:
         """Set custom message."""
@@ -166,85 +460,93 @@ class GeekMagicApiClient:
         await self._api_wrapper("get", "set", params={"note": note, "rpm": rpm, "force": "true" if force else "false",
                                                       "timeout": timeout}, is_json=False)
 
-    async def async_upload_file(self, file_data: bytes, filename: str) -> None:
+    async def async_upload_file(self, file_data: bytes, filename: str, directory: str = "/image/") -> None:
         """Upload a file to the device."""
-        # /doUpload?dir=/image/
-        # The device sends duplicate Content-Length headers which aiohttp rejects.
-        # We use requests (via executor) as a workaround.
-        loop = asyncio.get_running_loop()
-
-        def _upload():
-            import requests
-            # files argument for requests handles multipart
-            files = {"file": (filename, file_data, "image/jpeg")}
-
-            for attempt in range(2):
-                try:
-                    resp = requests.post(
-                        f"{self._url}/doUpload",
-                        params={"dir": "/image/"},
-                        files=files,
-                        timeout=20
-                    )
-                    if resp.status_code != 200:
-                        _LOGGER.error("Upload failed: %s %s", resp.status_code, resp.text)
-                    resp.raise_for_status()
-                    return
-                except Exception as err:
-                    if attempt == 1:
-                        raise err
-                    _LOGGER.debug("Retrying /doUpload after error: %s", err)
-
-        await loop.run_in_executor(None, _upload)
-
-    async def _api_wrapper(self, method: str, url: str, data: dict | aiohttp.FormData | None = None,
-                           params: dict | None = None, is_json: bool = True) -> dict | str | None:
-        """Get information from the API."""
+        # /doUpload?dir=/image/ (or /gif/ for small images)
+        file_type = "image/gif" if filename.lower().endswith(".gif") else "image/jpeg"
+        body, content_type = _encode_multipart("file", filename, file_data, file_type)
+        try:
+            result = await self._api_wrapper("post", "doUpload", data=body, params={"dir": directory},
+                                             is_json=False, content_type=content_type, timeout=20, attempts=2,
+                                             key=f"upload:{directory}{filename}")
+            if result is None:
+                raise Exception(f"Upload of {filename} to {self._url} failed: 404")
+            if latency := self.metrics.endpoint("doUpload").last_latency:
+                self.metrics.last_upload_bytes = len(body)
+                self.metrics.last_upload_throughput = round(len(body) / latency)
+        finally:
+            self.inventory_version += 1
+
+    async def _api_wrapper(self, method: str, url: str, data: dict | bytes | None = None,
+                           params: dict | None = None, is_json: bool = True, content_type: str | None = None,
+                           timeout: float = 10, attempts: int = 1, priority: int = PRIORITY_USER,
+                           key: str | None = None) -> dict | str | None:
+        """Get information from the API.
+
+        Requests go through the device command queue; commands queued under the
+        same ``key`` are coalesced so only the latest one is sent.
+        """
         if params is None:
             params = {}
 
-        headers = {}
-        request_kwargs = {
-            "method": method,
-            "url": f"{self._url}/{url}",
-            "params": params,
-        }
-
-        if data is not None:
-            if isinstance(data, dict):
-                headers["Content-type"] = "application/json; charset=UTF-8"
-                request_kwargs["json"] = data
+        body = b""
+        if isinstance(data, dict):
+            content_type = "application/json; charset=UTF-8"
+            body = json.dumps(data).encode()
+        elif data is not None:
+            body = data
+
+        # /set calls differ a lot by what is set
+        metrics = self.metrics.endpoint(f"{url}?{next(iter(params))}" if url == "set" and params else url)
+
+        def _on_retry(err: BaseException) -> None:
+            metrics.retries += 1
+
+        async def _send() -> tuple[int, bytes]:
+            started = time.monotonic()
+            try:
+                status, response = await self._transport.request(
+                    method, url, params=params, body=body, content_type=content_type,
+                    timeout=timeout, attempts=attempts, on_retry=_on_retry,
+                )
+            except asyncio.TimeoutError as err:
+                metrics.record_error(err, timeout=True)
+                raise
+            except Exception as err:
+                metrics.record_error(err)
+                raise
+
+            if status >= 400 and status != 404:
+                metrics.record_error(GeekMagicTransportError(f"HTTP {status}"))
             else:
-                # FormData or other types (like bytes, string), let aiohttp handle content-type
-                request_kwargs["data"] = data
-
-        request_kwargs["headers"] = headers
+                metrics.record(time.monotonic() - started, len(body), len(response))
+            return status, response
 
         try:
-            async with async_timeout.timeout(10):
-                response = await self._session.request(**request_kwargs)
-                _LOGGER.debug("Requesting %s with params %s", f"{self._url}/{url}", params)
+            _LOGGER.debug("Requesting %s with params %s", f"{self._url}/{url}", params)
+            status, response = await self._queue.submit(_send, priority=priority, key=key)
 
-                if response.status == 404:
-                    _LOGGER.info("404 received from %s, using last known value if available", f"{self._url}/{url}")
-                    return None
+            if status == 404:
+                _LOGGER.info("404 received from %s, using last known value if available", f"{self._url}/{url}")
+                return None
 
-                response.raise_for_status()
+            if status >= 400:
+                _LOGGER.error("Request %s failed: %s %s", f"{self._url}/{url}", status,
+                              response.decode("utf-8", errors="replace"))
+                raise GeekMagicTransportError(f"HTTP {status}")
 
-                if is_json:
-                    json_data = await response.json(content_type=None)
-                    return json_data
+            if is_json:
+                json_data = json.loads(response)
+                return json_data
 
-                text_data = await response.text()
-                if text_data == "FAIL":
-                    _LOGGER.warning("Request %s with params %s returned FAIL", f"{self._url}/{url}", params)
-                return text_data
+            text_data = response.decode("utf-8", errors="replace")
+            if text_data == "FAIL":
+                _LOGGER.warning("Request %s with params %s returned FAIL", f"{self._url}/{url}", params)
+            return text_data
 
         except asyncio.TimeoutError as exception:
             raise Exception(f"Timeout error fetching information from {self._url} - {exception}") from exception
-        except (aiohttp.ClientError, socket.gaierror) as exception:
+        except (OSError, asyncio.IncompleteReadError, GeekMagicTransportError) as exception:
             raise Exception(f"Error fetching information from {self._url} - {exception}") from exception
         except Exception as exception:  # pylint: disable=broad-except
             raise Exception(f"Something really wrong happened! - {exception}") from exception
-
-        return None
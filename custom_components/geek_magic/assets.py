@@ -0,0 +1,270 @@
+"""Tracking of image content stored on Geek Magic devices."""
+from __future__ import annotations
+
+import hashlib
+import logging
+import time
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN, CONF_MIN_FREE_SPACE, DEFAULT_MIN_FREE_SPACE
+
+if TYPE_CHECKING:
+    from .coordinator import GeekMagicDataUpdateCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+SAVE_DELAY = 10
+
+# DeviceState field listing the files of each device directory
+INVENTORY_KEYS = {
+    "/image/": "images",
+    "/gif/": "small_images",
+}
+
+
+class StoredFile:
+    """A file uploaded by this integration."""
+
+    __slots__ = ("digest", "size", "used", "pinned")
+
+    def __init__(self, digest: str, size: int, used: float, pinned: bool = False) -> None:
+        self.digest = digest
+        self.size = size
+        self.used = used
+        self.pinned = pinned
+
+
+class DeviceAssetStore:
+    """Remembers what this integration stored on a device and keeps room for more.
+
+    Uploads of content the device already holds are skipped; the coordinator's
+    image list confirms the file still exists. Before an upload that would go
+    below the configured free space, the least recently used files uploaded by
+    this integration are deleted. Pinned files, slideshow and sequence frames
+    and files uploaded by other means are never deleted.
+
+    With double buffering, content is uploaded to whichever of two filenames is
+    not on screen, so the display never shows a partly written file.
+    """
+
+    def __init__(self, hass: HomeAssistant, coordinator: GeekMagicDataUpdateCoordinator) -> None:
+        """Initialize the store."""
+        self._coordinator = coordinator
+        self._store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.{coordinator.config_entry.entry_id}.assets"
+        )
+        # directory + filename -> what was uploaded there
+        self._files: dict[str, StoredFile] = {}
+        # /image/ filename last shown by this integration
+        self._shown: str | None = None
+
+    async def async_load(self) -> None:
+        """Load known files from storage."""
+        if (stored := await self._store.async_load()) is None:
+            return
+
+        if "files" in stored:
+            self._files = {
+                path: StoredFile(item["hash"], item["size"], item["used"], item.get("pinned", False))
+                for path, item in stored["files"].items()
+            }
+        else:
+            # Saved before sizes were tracked; they are learned on the next upload
+            self._files = {path: StoredFile(digest, 0, 0.0) for path, digest in stored.get("hashes", {}).items()}
+        self._shown = stored.get("shown")
+
+    @staticmethod
+    def content_filename(digest: str, extension: str = "jpg") -> str:
+        """Return the hash-derived filename for the given content digest."""
+        return f"gm-{digest[:16]}.{extension}"
+
+    def is_stored(self, filename: str, digest: str, directory: str = "/image/") -> bool:
+        """Return True if the device holds this content under this filename."""
+        files = getattr(self._coordinator.data, INVENTORY_KEYS[directory])
+        stored = self._files.get(f"{directory}{filename}")
+        return stored is not None and stored.digest == digest and filename in files
+
+    @staticmethod
+    def buffer_filenames(filename: str) -> tuple[str, str]:
+        """Return the two filenames double buffering alternates between."""
+        stem, _, extension = filename.rpartition(".")
+        return filename, f"{stem}_b.{extension}"
+
+    @property
+    def shown(self) -> str | None:
+        """Return the /image/ filename last shown by this integration."""
+        return self._shown
+
+    @property
+    def min_free_space(self) -> int:
+        """Return the free space (bytes) uploads must leave on the device."""
+        return int(self._coordinator.config_entry.options.get(CONF_MIN_FREE_SPACE, DEFAULT_MIN_FREE_SPACE)) * 1024
+
+    async def async_upload(self, data: bytes, filename: str, content_addressed: bool = False,
+                           directory: str = "/image/", double_buffer: bool = False) -> tuple[str, bool]:
+        """Upload content unless the device already has it, making room for it first.
+
+        With ``double_buffer`` the content goes to the buffer filename that is not
+        on screen, unless either buffer already holds it.
+
+        Returns the device filename and whether an upload took place.
+        """
+        digest = hashlib.sha256(data).hexdigest()
+        if content_addressed:
+            filename = self.content_filename(digest, filename.rsplit(".", 1)[-1])
+        elif double_buffer:
+            buffers = self.buffer_filenames(filename)
+            filename = next(
+                (buffer for buffer in buffers if self.is_stored(buffer, digest, directory)),
+                buffers[1] if self._shown == buffers[0] else buffers[0],
+            )
+
+        path = f"{directory}{filename}"
+        if self.is_stored(filename, digest, directory):
+            _LOGGER.debug("Skipping upload of %s to %s, content unchanged", path, self._coordinator.client.url)
+            self.async_touch(filename, directory)
+            return filename, False
+
+        await self._async_make_room(len(data), path)
+
+        # Whatever was stored under this name is being overwritten
+        previous = self._files.pop(path, None)
+        await self._coordinator.client.async_upload_file(data, filename, directory)
+        self._files[path] = StoredFile(digest, len(data), time.time(), previous is not None and previous.pinned)
+        self._async_save()
+
+        # The inventory is refreshed on the slow tier; record the new file and space right away
+        state = self._coordinator.data
+        key = INVENTORY_KEYS[directory]
+        files = getattr(state, key)
+        changes: dict[str, Any] = {}
+        if filename not in files:
+            changes[key] = (*files, filename)
+        if state.free is not None:
+            changes["free"] = state.free - len(data) + (previous.size if previous is not None else 0)
+        if changes:
+            self._coordinator.async_update_state(**changes)
+
+        return filename, True
+
+    async def _async_make_room(self, size: int, path: str) -> None:
+        """Delete least recently used files until ``size`` bytes fit above the free space floor.
+
+        Raises before anything is deleted if not enough can be freed.
+        """
+        floor = self.min_free_space
+        replaced = self._files[path].size if path in self._files else 0
+        free = self._coordinator.data.free
+        if free is not None and free + replaced - size >= floor:
+            return
+
+        # The last known value may be stale, read it again before deleting anything
+        if (free := await self._coordinator.client.async_get_space()) is None:
+            _LOGGER.debug("Free space of %s unknown, uploading without making room", self._coordinator.client.url)
+            return
+        self._coordinator.async_update_state(free=free)
+        needed = size - replaced + floor - free
+        if needed <= 0:
+            return
+
+        state = self._coordinator.data
+        protected = {
+            f"/image/{filename}"
+            for filename in (*self._coordinator.slideshow.filenames, *self._coordinator.sequence.filenames, self._shown)
+        }
+        evicted: list[str] = []
+        for candidate in sorted(self._files, key=lambda candidate: self._files[candidate].used):
+            if needed <= 0:
+                break
+            directory, _, filename = candidate.rpartition("/")
+            if (candidate == path or candidate in protected or self._files[candidate].pinned
+                    or filename not in getattr(state, INVENTORY_KEYS[f"{directory}/"])):
+                continue
+            evicted.append(candidate)
+            needed -= self._files[candidate].size
+
+        if needed > 0:
+            raise HomeAssistantError(
+                f"Not enough free space on {self._coordinator.client.url} for {path} ({size} bytes): "
+                f"{free} bytes free, {floor} bytes must stay free"
+            )
+
+        for candidate in evicted:
+            directory, _, filename = candidate.rpartition("/")
+            _LOGGER.info("Deleting least recently used %s from %s to make room for %s",
+                         candidate, self._coordinator.client.url, path)
+            await self._coordinator.client.async_delete_image(filename, f"{directory}/")
+            freed = self._files[candidate].size
+            self.async_forget(filename, f"{directory}/")
+            if (free := self._coordinator.data.free) is not None:
+                self._coordinator.async_update_state(free=free + freed)
+
+    @callback
+    def async_touch(self, filename: str, directory: str = "/image/") -> None:
+        """Mark a file as just used, e.g. shown on the display."""
+        if (item := self._files.get(f"{directory}{filename}")) is not None:
+            item.used = time.time()
+            self._async_save()
+
+    @callback
+    def async_shown(self, filename: str) -> None:
+        """Record that an image was switched to on the display."""
+        self._shown = filename
+        self.async_touch(filename)
+        self._async_save()
+
+    @callback
+    def async_pin(self, filename: str, pinned: bool = True, directory: str = "/image/") -> bool:
+        """Protect a file from being deleted to make room, or remove the protection.
+
+        Returns False if the file was not uploaded by this integration.
+        """
+        if (item := self._files.get(f"{directory}{filename}")) is None:
+            return False
+        item.pinned = pinned
+        self._async_save()
+        return True
+
+    @callback
+    def async_forget(self, filename: str, directory: str = "/image/") -> None:
+        """Forget a file that was deleted from the device."""
+        if self._files.pop(f"{directory}{filename}", None) is not None:
+            self._async_save()
+
+        key = INVENTORY_KEYS[directory]
+        files = getattr(self._coordinator.data, key)
+        if filename in files:
+            self._coordinator.async_update_state(**{key: tuple(file for file in files if file != filename)})
+
+    @property
+    def stats(self) -> dict[str, int]:
+        """Return statistics of the files uploaded by this integration."""
+        return {
+            "files": len(self._files),
+            "bytes": sum(item.size for item in self._files.values()),
+            "pinned": sum(item.pinned for item in self._files.values()),
+            "min_free_space": self.min_free_space,
+        }
+
+    async def async_save(self) -> None:
+        """Write the known files now instead of after the save delay."""
+        await self._store.async_save(self._data_to_save())
+
+    @callback
+    def _async_save(self) -> None:
+        self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+
+    @callback
+    def _data_to_save(self) -> dict[str, Any]:
+        return {
+            "files": {
+                path: {"hash": item.digest, "size": item.size, "used": item.used, "pinned": item.pinned}
+                for path, item in self._files.items()
+            },
+            "shown": self._shown,
+        }
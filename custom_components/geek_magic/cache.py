@@ -0,0 +1,253 @@
+"""Local caches for Geek Magic."""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import logging
+import os
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+
+from homeassistant.core import HomeAssistant
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class RenderCache:
+    """Size-bounded LRU cache of rendered images on disk, keyed by a hash of the HTML."""
+
+    def __init__(self, hass: HomeAssistant, directory: str, max_bytes: int) -> None:
+        """Initialize the cache."""
+        self._hass = hass
+        self._directory = directory
+        self._max_bytes = max_bytes
+        # key -> (size, written at), least recently used first
+        self._entries: OrderedDict[str, tuple[int, float]] = OrderedDict()
+        self._total_bytes = 0
+        self._loaded = False
+        self._load_lock = asyncio.Lock()
+        self._rendering: dict[str, asyncio.Future[bytes]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(html: str) -> str:
+        """Return the cache key for the given HTML."""
+        return hashlib.sha256(html.encode("utf-8")).hexdigest()
+
+    @property
+    def stats(self) -> dict[str, int]:
+        """Return cache statistics."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "entries": len(self._entries),
+            "bytes": self._total_bytes,
+            "max_bytes": self._max_bytes,
+        }
+
+    async def async_get_or_render(self, html: str, render: Callable[[], Awaitable[bytes]],
+                                  ttl: int | None = None) -> bytes:
+        """Return the cached image for the HTML, rendering and storing it on a miss."""
+        await self._async_load()
+        key = self.key(html)
+
+        if (data := await self._async_get(key, ttl)) is not None:
+            self.hits += 1
+            _LOGGER.debug("Render cache hit for %s (%s)", key[:12], self.stats)
+            return data
+
+        # Several devices often render the same HTML at once; render it only once
+        if (pending := self._rendering.get(key)) is not None:
+            self.hits += 1
+            return await asyncio.shield(pending)
+
+        self.misses += 1
+        future: asyncio.Future[bytes] = asyncio.get_running_loop().create_future()
+        self._rendering[key] = future
+        try:
+            data = await render()
+            await self._async_put(key, data)
+        except BaseException as err:
+            future.set_exception(err)
+            # Mark as retrieved, the error is raised to this caller
+            future.exception()
+            raise
+        else:
+            future.set_result(data)
+        finally:
+            del self._rendering[key]
+
+        _LOGGER.debug("Render cache miss for %s (%s)", key[:12], self.stats)
+        return data
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self._directory, f"{key}.jpg")
+
+    async def _async_load(self) -> None:
+        """Index the files already on disk, oldest first."""
+        if self._loaded:
+            return
+
+        async with self._load_lock:
+            if self._loaded:
+                return
+
+            def _scan() -> list[tuple[str, int, float]]:
+                os.makedirs(self._directory, exist_ok=True)
+                found = []
+                with os.scandir(self._directory) as it:
+                    for item in it:
+                        if item.is_file() and item.name.endswith(".jpg"):
+                            stat = item.stat()
+                            found.append((item.name[:-4], stat.st_size, stat.st_mtime))
+                return sorted(found, key=lambda entry: entry[2])
+
+            for key, size, written in await self._hass.async_add_executor_job(_scan):
+                self._entries[key] = (size, written)
+                self._total_bytes += size
+            self._loaded = True
+            await self._async_evict()
+
+    async def _async_get(self, key: str, ttl: int | None) -> bytes | None:
+        """Return cached data if present and fresh."""
+        if (entry := self._entries.get(key)) is None:
+            return None
+
+        if ttl and time.time() - entry[1] > ttl:
+            return None
+
+        def _read() -> bytes | None:
+            try:
+                with open(self._path(key), "rb") as f:
+                    return f.read()
+            except FileNotFoundError:
+                return None
+
+        if (data := await self._hass.async_add_executor_job(_read)) is None:
+            self._forget(key)
+            return None
+
+        self._entries.move_to_end(key)
+        return data
+
+    async def _async_put(self, key: str, data: bytes) -> None:
+        """Store data and evict the least recently used entries over the size bound."""
+        if len(data) > self._max_bytes:
+            return
+
+        path = self._path(key)
+
+        def _write() -> None:
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+
+        try:
+            await self._hass.async_add_executor_job(_write)
+        except OSError as err:
+            _LOGGER.warning("Couldn't write render cache entry: %s", err)
+            return
+
+        self._forget(key)
+        self._entries[key] = (len(data), time.time())
+        self._total_bytes += len(data)
+        await self._async_evict()
+
+    async def _async_evict(self) -> None:
+        """Remove least recently used entries until under the size bound."""
+        evicted = []
+        while self._total_bytes > self._max_bytes and self._entries:
+            key = next(iter(self._entries))
+            self._forget(key)
+            evicted.append(self._path(key))
+
+        if not evicted:
+            return
+
+        def _remove() -> None:
+            for path in evicted:
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+
+        await self._hass.async_add_executor_job(_remove)
+
+    def _forget(self, key: str) -> None:
+        if (entry := self._entries.pop(key, None)) is not None:
+            self._total_bytes -= entry[0]
+
+
+class CachedImage:
+    """A prepared image and the validator of the source it was made from."""
+
+    __slots__ = ("validator", "data")
+
+    def __init__(self, validator: tuple, data: bytes) -> None:
+        self.validator = validator
+        self.data = data
+
+
+class ImageCache:
+    """Byte-bounded in-memory LRU cache of prepared images.
+
+    Entries are keyed by source, resize mode and target size, and carry the
+    source validator (mtime and size for files, ETag/Last-Modified for URLs).
+    """
+
+    def __init__(self, max_bytes: int) -> None:
+        """Initialize the cache."""
+        self._max_bytes = max_bytes
+        self._entries: OrderedDict[tuple, CachedImage] = OrderedDict()
+        self._total_bytes = 0
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+
+    @property
+    def stats(self) -> dict[str, int | float]:
+        """Return cache statistics."""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "revalidated": self.revalidated,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "entries": len(self._entries),
+            "bytes": self._total_bytes,
+            "max_bytes": self._max_bytes,
+        }
+
+    def get(self, key: tuple) -> CachedImage | None:
+        """Return the entry for a key without validating it."""
+        if (entry := self._entries.get(key)) is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    def put(self, key: tuple, validator: tuple, data: bytes) -> None:
+        """Store a prepared image, evicting least recently used entries over the bound."""
+        if (old := self._entries.pop(key, None)) is not None:
+            self._total_bytes -= len(old.data)
+        if len(data) > self._max_bytes:
+            return
+
+        self._entries[key] = CachedImage(validator, data)
+        self._total_bytes += len(data)
+        while self._total_bytes > self._max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._total_bytes -= len(evicted.data)
+
+    def record_hit(self, revalidated: bool = False) -> None:
+        """Count a lookup served from the cache."""
+        self.hits += 1
+        if revalidated:
+            self.revalidated += 1
+        _LOGGER.debug("Image cache hit (%s)", self.stats)
+
+    def record_miss(self) -> None:
+        """Count a lookup that needed a full fetch and resize."""
+        self.misses += 1
+        _LOGGER.debug("Image cache miss (%s)", self.stats)
@@ -1,24 +1,33 @@
 """Config flow for Geek Magic integration."""
 from __future__ import annotations
 
+import ipaddress
 import logging
 from typing import Any
 
 import voluptuous as vol
 from homeassistant import config_entries
+from homeassistant.components import network
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.data_entry_flow import FlowResult
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers import config_validation as cv
 
 from .api import GeekMagicApiClient
+from .discovery import DiscoveredDevice, async_discover
 from .const import (
     DOMAIN,
     CONF_IP_ADDRESS,
     DEFAULT_NAME,
+    CONF_SUBNET,
+    MAX_DISCOVERY_HOSTS,
     CONF_RENDER_URL,
     DEFAULT_RENDER_URL,
     CONF_HTML_TEMPLATE,
     DEFAULT_HTML_TEMPLATE,
+    CONF_INVENTORY_INTERVAL,
+    DEFAULT_INVENTORY_INTERVAL,
+    CONF_MIN_FREE_SPACE,
+    DEFAULT_MIN_FREE_SPACE,
 )
 
 LOGGER = logging.getLogger(__name__)
@@ -37,10 +46,23 @@ class GeekMagicConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
     VERSION = 1
 
+    def __init__(self) -> None:
+        """Initialize the flow."""
+        self._discovered: dict[str, DiscoveredDevice] = {}
+
     async def async_step_user(
             self, user_input: dict[str, Any] | None = None
     ) -> FlowResult:
         """Handle the initial step."""
+        return self.async_show_menu(
+            step_id="user",
+            menu_options={"discover": "Scan the network for displays", "manual": "Enter an IP address"},
+        )
+
+    async def async_step_manual(
+            self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Handle a display entered by address."""
         errors: dict[str, str] = {}
         if user_input is not None:
             # Clean up IP address if it was entered as a URL
@@ -68,14 +90,99 @@ class GeekMagicConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 return self.async_create_entry(title=DEFAULT_NAME, data=data, options=options)
 
         return self.async_show_form(
-            step_id="user", data_schema=STEP_USER_DATA_SCHEMA, errors=errors
+            step_id="manual", data_schema=STEP_USER_DATA_SCHEMA, errors=errors
         )
 
+    async def async_step_discover(
+            self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Scan a subnet for displays."""
+        errors: dict[str, str] = {}
+        if user_input is not None:
+            try:
+                subnet = ipaddress.IPv4Network(user_input[CONF_SUBNET].strip(), strict=False)
+            except ValueError:
+                errors["base"] = "invalid_subnet"
+            else:
+                if subnet.num_addresses > MAX_DISCOVERY_HOSTS:
+                    errors["base"] = "subnet_too_large"
+                else:
+                    configured = {entry.data.get(CONF_IP_ADDRESS) for entry in self._async_current_entries()}
+                    devices = await async_discover(subnet, skip=configured)
+                    if devices:
+                        self._discovered = {device.host: device for device in devices}
+                        return await self.async_step_pick()
+                    errors["base"] = "no_devices_found"
+
+        return self.async_show_form(
+            step_id="discover",
+            data_schema=vol.Schema(
+                {vol.Required(CONF_SUBNET, default=await self._async_default_subnet()): str}
+            ),
+            errors=errors,
+        )
+
+    async def async_step_pick(
+            self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Add the displays picked from the discovered ones."""
+        errors: dict[str, str] = {}
+        if user_input is not None:
+            hosts = user_input[CONF_IP_ADDRESS]
+            if hosts:
+                options = {CONF_RENDER_URL: user_input.get(CONF_RENDER_URL, DEFAULT_RENDER_URL)}
+                # A flow creates one entry; the other displays are added by import flows
+                for host in hosts[1:]:
+                    self.hass.async_create_task(
+                        self.hass.config_entries.flow.async_init(
+                            DOMAIN,
+                            context={"source": config_entries.SOURCE_IMPORT},
+                            data={CONF_IP_ADDRESS: host, "title": self._discovered[host].label, **options},
+                        )
+                    )
+                self._async_abort_entries_match({CONF_IP_ADDRESS: hosts[0]})
+                return self.async_create_entry(
+                    title=self._discovered[hosts[0]].label, data={CONF_IP_ADDRESS: hosts[0]}, options=options
+                )
+            errors["base"] = "no_devices_selected"
+
+        devices = {host: device.label for host, device in self._discovered.items()}
+        return self.async_show_form(
+            step_id="pick",
+            data_schema=vol.Schema(
+                {
+                    vol.Required(CONF_IP_ADDRESS, default=list(devices)): cv.multi_select(devices),
+                    vol.Optional(CONF_RENDER_URL, default=DEFAULT_RENDER_URL): str,
+                }
+            ),
+            errors=errors,
+        )
+
+    async def async_step_import(self, import_data: dict[str, Any]) -> FlowResult:
+        """Add a display picked in another flow's discovery."""
+        host = import_data[CONF_IP_ADDRESS]
+        self._async_abort_entries_match({CONF_IP_ADDRESS: host})
+        return self.async_create_entry(
+            title=import_data.get("title", DEFAULT_NAME),
+            data={CONF_IP_ADDRESS: host},
+            options={CONF_RENDER_URL: import_data.get(CONF_RENDER_URL, DEFAULT_RENDER_URL)},
+        )
+
+    async def _async_default_subnet(self) -> str:
+        """Return the /24 network of Home Assistant's own address."""
+        try:
+            source_ip = await network.async_get_source_ip(self.hass)
+            return str(ipaddress.IPv4Network(f"{source_ip}/24", strict=False))
+        except Exception:  # pylint: disable=broad-except
+            return ""
+
     async def _test_credentials(self, url: str) -> None:
         """Validate credentials."""
-        session = async_get_clientsession(self.hass)
-        client = GeekMagicApiClient(session=session, url=url)
-        await client.async_get_data()
+        client = GeekMagicApiClient(url=url)
+        try:
+            await client.async_get_data()
+        finally:
+            await client.async_close()
 
     @staticmethod
     @callback
@@ -98,7 +205,8 @@ class GeekMagicOptionsFlowHandler(config_entries.OptionsFlow):
     ) -> FlowResult:
         """Manage the options."""
         if user_input is not None:
-            return self.async_create_entry(title="", data=user_input)
+            # Keep options managed elsewhere (e.g. the update interval entity)
+            return self.async_create_entry(title="", data={**self._config_entry.options, **user_input})
 
         return self.async_show_form(
             step_id="init",
@@ -114,6 +222,18 @@ class GeekMagicOptionsFlowHandler(config_entries.OptionsFlow):
                             CONF_HTML_TEMPLATE, DEFAULT_HTML_TEMPLATE
                         ),
                     ): str,
+                    vol.Optional(
+                        CONF_INVENTORY_INTERVAL,
+                        default=self._config_entry.options.get(
+                            CONF_INVENTORY_INTERVAL, DEFAULT_INVENTORY_INTERVAL
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=30, max=86400)),
+                    vol.Optional(
+                        CONF_MIN_FREE_SPACE,
+                        default=self._config_entry.options.get(
+                            CONF_MIN_FREE_SPACE, DEFAULT_MIN_FREE_SPACE
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=0)),
                 }
             ),
         )
@@ -4,11 +4,82 @@ DOMAIN = "geek_magic"
 CONF_IP_ADDRESS = "ip_address"
 DEFAULT_NAME = "Geek Magic"
 
+# LAN discovery: per-host timeout (seconds), concurrent probes and the largest network scanned
+CONF_SUBNET = "subnet"
+DISCOVERY_TIMEOUT = 1.5
+DISCOVERY_PARALLEL = 128
+MAX_DISCOVERY_HOSTS = 1024
+
+# Display resolution in pixels, and the small (weather) image slot of the factory firmware
+DISPLAY_SIZE = (240, 240)
+SMALL_IMAGE_SIZE = (80, 80)
+
+# Limits for source images: download/file size and decoded pixel count
+MAX_SOURCE_BYTES = 20 * 1024 * 1024
+MAX_SOURCE_PIXELS = 64_000_000
+
+# JPEG encoding for uploads
+DEFAULT_JPEG_QUALITY = 75
+MIN_JPEG_QUALITY = 30
+
+# Animated GIFs: frames kept for the device, frames accepted from the source, and default frame duration (ms)
+DEFAULT_MAX_FRAMES = 30
+MAX_SOURCE_FRAMES = 1000
+DEFAULT_FRAME_DURATION = 100
+
 CONF_RENDER_URL = "render_url"
 DEFAULT_RENDER_URL = "https://text2image.gumerbaev.ru/render"
 CONF_HTML_TEMPLATE = "html_template"
 CONF_UPDATE_INTERVAL = "update_interval"
 DEFAULT_UPDATE_INTERVAL = 30
+CONF_INVENTORY_INTERVAL = "inventory_interval"
+DEFAULT_INVENTORY_INTERVAL = 600
+# Free space (KB) uploads must leave on the device; older uploads are deleted to keep it
+CONF_MIN_FREE_SPACE = "min_free_space"
+DEFAULT_MIN_FREE_SPACE = 100
+
+# Stores of each config entry, saved as .storage/geek_magic.<entry_id>.<name>
+ENTRY_STORES = ("state", "assets", "slideshow")
+
+# Local caches, stored under the Home Assistant config directory
+CACHE_DIR = ".geek_magic"
+DATA_RENDER_CACHE = f"{DOMAIN}_render_cache"
+RENDER_CACHE_MAX_BYTES = 32 * 1024 * 1024
+DATA_IMAGE_CACHE = f"{DOMAIN}_image_cache"
+IMAGE_CACHE_MAX_BYTES = 8 * 1024 * 1024
+
+# Devices served at the same time by broadcast service calls
+CONF_MAX_PARALLEL = "max_parallel"
+DEFAULT_MAX_PARALLEL = 8
+
+# Images prepared at the same time by bulk uploads
+PREPROCESS_PARALLEL = 4
+
+# Slideshow slide durations (seconds)
+DEFAULT_SLIDE_DURATION = 10
+MIN_SLIDE_DURATION = 1
+
+# Render services: deadline (seconds) of one render, delay before also asking the next service,
+# and failures in a row after which a service is skipped for the cooldown (seconds)
+RENDER_TIMEOUT = 15
+RENDER_HEDGE_DELAY = 2.0
+CIRCUIT_FAILURES = 3
+CIRCUIT_COOLDOWN = 60
+DATA_RENDER_CLIENT = f"{DOMAIN}_render_client"
+
+# Render-ahead sequences: frames uploaded ahead of the one on screen, and default seconds between frames
+DEFAULT_SEQUENCE_LOOKAHEAD = 3
+MAX_SEQUENCE_LOOKAHEAD = 10
+DEFAULT_SEQUENCE_INTERVAL = 60
+
+# Overall deadline (seconds) for one refresh of all device endpoints
+REFRESH_TIMEOUT = 20
+
+# Unreachable devices are probed at the update interval; full refreshes of a device whose refreshes fail
+# are retried after exponentially growing intervals, up to this many seconds
+BACKOFF_MAX_INTERVAL = 300
+# Random spread of retry intervals, so devices that failed together don't retry together
+BACKOFF_JITTER = 0.2
 
 DEFAULT_HTML_TEMPLATE = """<html lang='en'>
 <head>
@@ -1,21 +1,42 @@
 """DataUpdateCoordinator for Geek Magic."""
 from __future__ import annotations
 
+import asyncio
 import logging
+import random
+import time
 from datetime import timedelta
+from typing import Any
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.update_coordinator import (
     DataUpdateCoordinator,
     UpdateFailed,
 )
 
 from .api import GeekMagicApiClient
-from .const import DOMAIN
+from .assets import DeviceAssetStore
+from .sequence import FrameSequence
+from .slideshow import Slideshow
+from .state import FIELDS, DeviceState
+from .throttle import LatestWinsThrottle
+from .const import (
+    DOMAIN,
+    REFRESH_TIMEOUT,
+    CONF_INVENTORY_INTERVAL,
+    DEFAULT_INVENTORY_INTERVAL,
+    BACKOFF_MAX_INTERVAL,
+    BACKOFF_JITTER,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
+STORAGE_VERSION = 1
+# The last known state is written at most this often (seconds)
+STATE_SAVE_DELAY = 60
+
 
 class GeekMagicDataUpdateCoordinator(DataUpdateCoordinator):
     """Class to manage fetching Geek Magic data."""
@@ -36,30 +57,173 @@ class GeekMagicDataUpdateCoordinator(DataUpdateCoordinator):
         )
         self.client = client
         self.config_entry = entry
+        self.assets = DeviceAssetStore(hass, self)
+        self.slideshow = Slideshow(hass, self)
+        self.sequence = FrameSequence(hass, self)
+        # send_html and send_image deliveries, rate limited on request
+        self.throttle = LatestWinsThrottle()
+        self.data = DeviceState()
+        # Fields that changed with the last listener update
+        self.changed: frozenset[str] = frozenset()
+        self._notified: DeviceState | None = None
+        self.last_update_duration: float | None = None
+        # Consecutive failed refreshes; while non-zero, refreshes start with a liveness probe
+        self.failures = 0
+        # While refreshes fail, the next full refresh waits until then (monotonic time)
+        self._retry_at = 0.0
+        self._inventory_refreshed_at: float | None = None
+        self._inventory_version: int | None = None
+        self._store: Store[dict[str, Any]] = Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry.entry_id}.state")
+
+    async def async_restore_state(self) -> None:
+        """Start from the state last seen, until the first refresh completes."""
+        if (stored := await self._store.async_load()) is not None:
+            self.data = DeviceState(**{field: stored.get(field) for field in FIELDS})
+            self._notified = self.data
+
+    async def async_save_state(self) -> None:
+        """Write the last known state now instead of after the save delay."""
+        await self._store.async_save(self._data_to_save())
 
     def update_interval_seconds(self, interval: int) -> None:
         """Update the coordinator's update interval."""
         self.update_interval = timedelta(seconds=interval)
         _LOGGER.debug("Update interval changed to %s seconds", interval)
 
-    async def _async_update_data(self):
-        """Update data via library."""
+    def _inventory_due(self, now: float) -> bool:
+        """Return True if the slow tier (storage and file lists) should be refreshed."""
+        if self._inventory_refreshed_at is None or self._inventory_version != self.client.inventory_version:
+            return True
+
+        interval = self.config_entry.options.get(CONF_INVENTORY_INTERVAL, DEFAULT_INVENTORY_INTERVAL)
+        return now - self._inventory_refreshed_at >= interval
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Notify entities, recording which fields changed since they were last notified."""
+        self.changed = self.data.changes(self._notified)
+        self._notified = self.data
+        if self.changed:
+            self._store.async_delay_save(self._data_to_save, STATE_SAVE_DELAY)
+        super().async_update_listeners()
+
+    @callback
+    def _data_to_save(self) -> dict[str, Any]:
+        """Return the state to store."""
+        return {field: getattr(self.data, field) for field in FIELDS}
+
+    @callback
+    def async_update_state(self, **changes) -> None:
+        """Apply a change known without polling, e.g. after a command, and notify entities."""
+        self.data = self.data.replace(**changes)
+        self.async_update_listeners()
+
+    def _backoff_delay(self) -> float:
+        """Return the jittered delay (seconds) of the next full refresh after the current number of failures."""
+        base = self.update_interval.total_seconds()
+        # Clamp after the jitter, so the cap holds
+        delay = base * 2 ** self.failures * random.uniform(1 - BACKOFF_JITTER, 1 + BACKOFF_JITTER)
+        return max(base, min(BACKOFF_MAX_INTERVAL, delay))
+
+    async def _async_update_data(self) -> DeviceState:
+        """Update data via library, backing off while the device is unreachable."""
+        if self.failures:
+            # One connection attempt per update interval instead of a full refresh running into timeouts,
+            # so a device coming back is noticed at once
+            try:
+                await self.client.async_probe()
+            except Exception as e:  # pylint: disable=broad-except
+                # Down, so refresh as soon as a probe gets through again
+                self._retry_at = 0.0
+                raise UpdateFailed(str(e)) from e
+            if (wait := self._retry_at - time.monotonic()) > 0:
+                # Accepts connections but its refreshes failed: back off
+                raise UpdateFailed(f"{self.client.url} failed {self.failures} refreshes in a row, "
+                                   f"retrying in {wait:.0f} s")
+
         try:
-            data = await self.client.async_get_data()
-            data["free"] = await self.client.async_get_space()
-            data["images"] = await self.client.async_get_images()
+            data = await self._async_fetch()
+        except UpdateFailed:
+            self.failures += 1
+            self._retry_at = time.monotonic() + self._backoff_delay()
+            # The device may have been reset while away
+            self._inventory_refreshed_at = None
+            _LOGGER.debug("Refresh of %s failed %d times in a row, probing every %.0f s",
+                          self.client.url, self.failures, self.update_interval.total_seconds())
+            raise
+
+        if self.failures:
+            _LOGGER.debug("%s is reachable again after %d failed refreshes", self.client.url, self.failures)
+            self.failures = 0
+        return data
+
+    async def _async_fetch(self) -> DeviceState:
+        """Fetch the device state, merging partial results into the current snapshot."""
+        started = time.monotonic()
+        changes = {}
 
-            model = data["m"]
+        state_task = asyncio.create_task(self.client.async_get_data())
+
+        async def _get_small_images() -> list[str] | None:
+            # Small images exist only on the factory firmware, so wait for the model first
+            state = await asyncio.shield(state_task)
+            model = state.get("m")
             if isinstance(model, str) and model != "aydarik":
-                data["small_images"] = await self.client.async_get_small_images()
+                return await self.client.async_get_small_images()
+            return None
+
+        # Theme, brightness and model are polled every time, the inventory only when due
+        tasks = {"state": state_task}
+        inventory_version = self.client.inventory_version
+        refresh_inventory = self._inventory_due(started)
+        if refresh_inventory:
+            tasks["free"] = asyncio.create_task(self.client.async_get_space())
+            tasks["images"] = asyncio.create_task(self.client.async_get_images())
+            tasks["small_images"] = asyncio.create_task(_get_small_images())
 
-            return data
+        done, pending = await asyncio.wait(tasks.values(), timeout=REFRESH_TIMEOUT)
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+
+        # Merge whatever succeeded; failed parts keep their last known value
+        errors: list[str] = []
+        inventory_failed = False
+        for key, task in tasks.items():
+            if task not in done:
+                errors.append(f"{key}: timed out after {REFRESH_TIMEOUT} s")
+                inventory_failed |= key != "state"
+                continue
+            if (error := task.exception()) is not None:
+                errors.append(f"{key}: {error}")
+                inventory_failed |= key != "state"
+                continue
+
+            result = task.result()
+            if key == "state":
+                # A part that failed before its first success is None; keep the restored value
+                state = {"theme": result["theme"], "brt": result["brt"], "model": result["m"]}
+                changes.update({field: value for field, value in state.items() if value is not None})
+            elif result is not None:
+                changes[key] = result
+
+        if refresh_inventory and not inventory_failed:
+            self._inventory_refreshed_at = started
+            self._inventory_version = inventory_version
+
+        self.last_update_duration = time.monotonic() - started
+        _LOGGER.debug(
+            "Refreshed %s (%s) in %.3f s (%d of %d parts failed)",
+            self.client.url, "full" if refresh_inventory else "state only",
+            self.last_update_duration, len(errors), len(tasks),
+        )
 
-        except Exception as e:
-            # Keep current data if already loaded
-            if isinstance(self.data["m"], str):
-                _LOGGER.debug("Couldn't update data: %s", e)
-                return self.data
+        if len(errors) == len(tasks):
+            # Entities become unavailable rather than showing stale data
+            raise UpdateFailed("; ".join(errors))
 
-            raise UpdateFailed(e) from e
+        for error in errors:
+            _LOGGER.debug("Couldn't update %s", error)
 
+        return self.data.replace(**changes)
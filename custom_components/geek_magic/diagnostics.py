@@ -0,0 +1,63 @@
+"""Diagnostics support for Geek Magic."""
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN, CONF_IP_ADDRESS, CONF_RENDER_URL, DATA_RENDER_CACHE, DATA_IMAGE_CACHE, DATA_RENDER_CLIENT
+from .coordinator import GeekMagicDataUpdateCoordinator
+from .render_service import parse_render_urls
+from .state import FIELDS
+
+# Addresses on the local network, and render URLs that may carry credentials
+TO_REDACT = {CONF_IP_ADDRESS, CONF_RENDER_URL}
+
+
+async def async_get_config_entry_diagnostics(hass: HomeAssistant, entry: ConfigEntry) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    coordinator: GeekMagicDataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]
+
+    caches = {}
+    if (render_cache := hass.data.get(DATA_RENDER_CACHE)) is not None:
+        caches["render"] = render_cache.stats
+    if (image_cache := hass.data.get(DATA_IMAGE_CACHE)) is not None:
+        caches["image"] = image_cache.stats
+
+    # Render services in the order of the entry's option, identified by position only
+    render_services = []
+    if (render_client := hass.data.get(DATA_RENDER_CLIENT)) is not None:
+        stats = render_client.stats
+        render_services = [stats.get(url) for url in parse_render_urls(entry.options.get(CONF_RENDER_URL))]
+
+    return {
+        "entry": {
+            "data": async_redact_data(dict(entry.data), TO_REDACT),
+            "options": async_redact_data(dict(entry.options), TO_REDACT),
+        },
+        "state": {field: getattr(coordinator.data, field) for field in FIELDS},
+        "coordinator": {
+            "last_update_success": coordinator.last_update_success,
+            "last_update_duration": coordinator.last_update_duration,
+            "update_interval": coordinator.update_interval.total_seconds() if coordinator.update_interval else None,
+            "failures": coordinator.failures,
+            "dropped_sends": coordinator.throttle.dropped,
+        },
+        "slideshow": {
+            "running": coordinator.slideshow.running,
+            "current": coordinator.slideshow.current,
+            "slides": len(coordinator.slideshow.filenames),
+        },
+        "sequence": {
+            "running": coordinator.sequence.running,
+            "position": coordinator.sequence.position,
+            "frames": coordinator.sequence.total,
+            "late": coordinator.sequence.late,
+        },
+        "assets": coordinator.assets.stats,
+        "metrics": coordinator.client.metrics.as_dict(),
+        "caches": caches,
+        "render_services": render_services,
+    }
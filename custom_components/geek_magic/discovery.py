@@ -0,0 +1,63 @@
+"""Discovery of Geek Magic displays on the local network."""
+from __future__ import annotations
+
+import asyncio
+import ipaddress
+import json
+import logging
+from collections.abc import Iterable
+
+from .api import GeekMagicTransport, GeekMagicTransportError
+from .const import DISCOVERY_PARALLEL, DISCOVERY_TIMEOUT
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class DiscoveredDevice:
+    """A display that answered a discovery probe."""
+
+    __slots__ = ("host", "model", "version")
+
+    def __init__(self, host: str, model: str, version: str | None) -> None:
+        self.host = host
+        self.model = model
+        self.version = version
+
+    @property
+    def label(self) -> str:
+        """Return a description for selection lists."""
+        return f"{self.model} ({self.host})"
+
+
+async def async_probe_host(host: str, timeout: float = DISCOVERY_TIMEOUT) -> DiscoveredDevice | None:
+    """Return the display at ``host``, or None if no display answers there."""
+    transport = GeekMagicTransport(host, max_connections=1)
+    try:
+        status, body = await transport.request("get", "v.json", timeout=timeout)
+        data = json.loads(body)
+    except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError, GeekMagicTransportError, ValueError):
+        return None
+    finally:
+        await transport.async_close()
+
+    # Other devices may serve /v.json too; a display reports its model
+    if status != 200 or not isinstance(data, dict) or not data.get("m"):
+        return None
+    return DiscoveredDevice(host, str(data["m"]), data.get("v"))
+
+
+async def async_discover(network: ipaddress.IPv4Network, skip: Iterable[str] = (),
+                         timeout: float = DISCOVERY_TIMEOUT,
+                         max_parallel: int = DISCOVERY_PARALLEL) -> list[DiscoveredDevice]:
+    """Probe every host of a network concurrently and return the displays found, by address."""
+    skip = set(skip)
+    semaphore = asyncio.Semaphore(max_parallel)
+
+    async def _probe(host: str) -> DiscoveredDevice | None:
+        async with semaphore:
+            return await async_probe_host(host, timeout)
+
+    hosts = [str(host) for host in network.hosts() if str(host) not in skip]
+    _LOGGER.debug("Scanning %d hosts of %s for displays", len(hosts), network)
+    results = await asyncio.gather(*(_probe(host) for host in hosts))
+    return [device for device in results if device is not None]
@@ -0,0 +1,45 @@
+"""Base entity for Geek Magic."""
+from __future__ import annotations
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import callback
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+
+from .const import DOMAIN
+from .coordinator import GeekMagicDataUpdateCoordinator
+
+
+class GeekMagicEntity(CoordinatorEntity[GeekMagicDataUpdateCoordinator]):
+    """Base class for Geek Magic entities.
+
+    State is written only when one of ``_state_fields`` changed or availability
+    flipped, not on every poll.
+    """
+
+    # DeviceState fields the entity state is derived from
+    _state_fields: frozenset[str] = frozenset()
+
+    def __init__(self, coordinator: GeekMagicDataUpdateCoordinator, entry: ConfigEntry) -> None:
+        """Initialize the entity."""
+        super().__init__(coordinator)
+        self._attr_has_entity_name = True
+        self._entry = entry
+        self._attr_device_info = {
+            "identifiers": {(DOMAIN, entry.entry_id)},
+            "name": entry.title,
+            "manufacturer": "Geek Magic",
+        }
+        self._written_available: bool | None = None
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write state if anything this entity shows has changed."""
+        if self.available == self._written_available and not self.coordinator.changed & self._state_fields:
+            return
+        self.async_write_ha_state()
+
+    @callback
+    def async_write_ha_state(self) -> None:
+        """Write the state, remembering the availability it was written with."""
+        self._written_available = self.available
+        super().async_write_ha_state()
@@ -0,0 +1,339 @@
+"""Image preparation for Geek Magic devices."""
+from __future__ import annotations
+
+import asyncio
+import io
+import logging
+import os
+from collections.abc import Callable
+
+import aiohttp
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
+
+from .cache import ImageCache
+from .const import (
+    DISPLAY_SIZE,
+    MAX_SOURCE_BYTES,
+    MAX_SOURCE_PIXELS,
+    DEFAULT_JPEG_QUALITY,
+    MIN_JPEG_QUALITY,
+    DEFAULT_MAX_FRAMES,
+    MAX_SOURCE_FRAMES,
+    DEFAULT_FRAME_DURATION,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+# Shrink by whole factors before resampling while the image stays this many times larger than the target
+REDUCING_GAP = 3.0
+
+
+def open_image(image_data: bytes, size: tuple[int, int], max_pixels: int = MAX_SOURCE_PIXELS):
+    """Open an image, refusing decompression bombs and decoding close to the target size."""
+    from PIL import Image
+
+    try:
+        img = Image.open(io.BytesIO(image_data))
+    except Image.DecompressionBombError as e:
+        raise ValueError(str(e)) from e
+
+    # Only the header has been read so far
+    width, height = img.size
+    if width * height > max_pixels:
+        raise ValueError(f"Image is too large ({width}x{height} pixels, limit is {max_pixels})")
+
+    # JPEG can decode at 1/2, 1/4 or 1/8 scale directly, staying at least as large as requested
+    img.draft("RGB", size)
+    return img
+
+
+def encode_jpeg(img, quality: int | None = None, max_bytes: int | None = None) -> bytes:
+    """Encode an image the way the firmware decodes fastest, within an optional byte budget.
+
+    The device decoder only handles baseline JPEG; 4:2:0 chroma subsampling keeps both the
+    upload and the decode small. If the budget is exceeded, the highest quality that fits is used.
+    """
+    if img.mode != "RGB":
+        img = img.convert("RGB")
+    quality = int(quality or DEFAULT_JPEG_QUALITY)
+
+    def _encode(q: int) -> bytes:
+        output = io.BytesIO()
+        img.save(output, format="JPEG", quality=q, optimize=True, progressive=False, subsampling="4:2:0")
+        return output.getvalue()
+
+    data = _encode(quality)
+    if max_bytes is None or len(data) <= max_bytes:
+        _LOGGER.debug("Encoded %dx%d JPEG at quality %d: %d bytes", *img.size, quality, len(data))
+        return data
+
+    # Binary search for the highest quality within the budget
+    low, high = MIN_JPEG_QUALITY, quality - 1
+    best, best_quality = None, MIN_JPEG_QUALITY
+    while low <= high:
+        mid = (low + high) // 2
+        candidate = _encode(mid)
+        if len(candidate) <= max_bytes:
+            best, best_quality = candidate, mid
+            low = mid + 1
+        else:
+            high = mid - 1
+
+    if best is None:
+        best = _encode(MIN_JPEG_QUALITY)
+        _LOGGER.warning("Image doesn't fit in %d bytes even at quality %d: %d bytes",
+                        max_bytes, MIN_JPEG_QUALITY, len(best))
+    else:
+        _LOGGER.debug("Encoded %dx%d JPEG at quality %d to fit %d bytes: %d bytes",
+                      *img.size, best_quality, max_bytes, len(best))
+    return best
+
+
+def reencode_jpeg(image_data: bytes, quality: int | None = None, max_bytes: int | None = None) -> bytes:
+    """Re-encode rendered output if it is not a baseline JPEG, is over budget or a quality is requested."""
+    img = open_image(image_data, DISPLAY_SIZE)
+    if (
+        img.format == "JPEG"
+        and not img.info.get("progressive")
+        and quality is None
+        and (max_bytes is None or len(image_data) <= max_bytes)
+    ):
+        return image_data
+
+    return encode_jpeg(img, quality, max_bytes)
+
+
+def _resize_frame(img, resize_mode: str, size: tuple[int, int]):
+    """Resize a decoded image according to the resize mode."""
+    from PIL import Image
+
+    target_width, target_height = size
+    if resize_mode == "stretch":
+        return img.resize(size, Image.Resampling.LANCZOS, reducing_gap=REDUCING_GAP)
+
+    if resize_mode == "crop":
+        # Crop: fill the display and take center
+        width, height = img.size
+        ratio = max(target_width / width, target_height / height)
+        new_width = int(width * ratio)
+        new_height = int(height * ratio)
+        img = img.resize((new_width, new_height), Image.Resampling.LANCZOS, reducing_gap=REDUCING_GAP)
+
+        left = (new_width - target_width) / 2
+        top = (new_height - target_height) / 2
+        right = (new_width + target_width) / 2
+        bottom = (new_height + target_height) / 2
+        return img.crop((left, top, right, bottom))
+
+    # fit / contain: longest side fills the display
+    width, height = img.size
+    if width > height:
+        new_width = target_width
+        new_height = int(height * (target_width / width))
+    else:
+        new_height = target_height
+        new_width = int(width * (target_height / height))
+    return img.resize((new_width, new_height), Image.Resampling.LANCZOS, reducing_gap=REDUCING_GAP)
+
+
+def resize_image(image_data: bytes, resize_mode: str, size: tuple[int, int] = DISPLAY_SIZE,
+                 quality: int | None = None, max_bytes: int | None = None) -> bytes:
+    """Resize an image for the display and encode it as JPEG."""
+    img = open_image(image_data, size)
+    if img.mode != "RGB":
+        img = img.convert("RGB")
+
+    return encode_jpeg(_resize_frame(img, resize_mode, size), quality, max_bytes)
+
+
+def prepare_animation(image_data: bytes, resize_mode: str, size: tuple[int, int] = DISPLAY_SIZE,
+                      max_frames: int = DEFAULT_MAX_FRAMES, max_bytes: int | None = None) -> bytes:
+    """Resize every frame of an (animated) image and encode it as a GIF the firmware plays smoothly.
+
+    Identical consecutive frames are merged, long animations are sampled down to
+    ``max_frames`` and all frames share one optimized palette. If the result is over
+    ``max_bytes``, frames and colors are reduced until it fits.
+    """
+    from PIL import Image, ImageSequence
+
+    source = open_image(image_data, size)
+
+    n_frames = getattr(source, "n_frames", 1)
+    if n_frames > MAX_SOURCE_FRAMES:
+        raise ValueError(f"Animation has {n_frames} frames, limit is {MAX_SOURCE_FRAMES}")
+    # Resize only about twice as many frames as may be kept
+    stride = max(1, n_frames // (max_frames * 2))
+
+    frames: list = []
+    durations: list[int] = []
+    previous = None
+    for index, frame in enumerate(ImageSequence.Iterator(source)):
+        duration = int(frame.info.get("duration") or DEFAULT_FRAME_DURATION)
+        if frames and index % stride:
+            durations[-1] += duration
+            continue
+
+        resized = _resize_frame(frame.convert("RGB"), resize_mode, size)
+        pixels = resized.tobytes()
+        if pixels == previous:
+            # Duplicate frame: show the previous one for longer instead
+            durations[-1] += duration
+            continue
+        frames.append(resized)
+        durations.append(duration)
+        previous = pixels
+
+    def _sample(count: int) -> tuple[list, list[int]]:
+        """Keep ``count`` evenly spaced frames, preserving the total duration."""
+        if len(frames) <= count:
+            return frames, durations
+        picked = [round(i * (len(frames) - 1) / (count - 1)) for i in range(count)] if count > 1 else [0]
+        sampled_durations = []
+        for index, start in enumerate(picked):
+            end = picked[index + 1] if index + 1 < len(picked) else len(frames)
+            sampled_durations.append(sum(durations[start:end]))
+        return [frames[i] for i in picked], sampled_durations
+
+    def _encode(selected: list, selected_durations: list[int], colors: int) -> bytes:
+        # One palette for all frames, built from a strip of every frame
+        width, height = selected[0].size
+        strip = Image.new("RGB", (width, height * len(selected)))
+        for index, frame in enumerate(selected):
+            strip.paste(frame, (0, height * index))
+        palette = strip.quantize(colors=colors, method=Image.Quantize.MEDIANCUT)
+
+        quantized = [frame.quantize(palette=palette, dither=Image.Dither.FLOYDSTEINBERG) for frame in selected]
+        output = io.BytesIO()
+        quantized[0].save(
+            output,
+            format="GIF",
+            save_all=True,
+            append_images=quantized[1:],
+            duration=selected_durations,
+            loop=0,
+            optimize=True,
+            disposal=1,
+        )
+        return output.getvalue()
+
+    count = min(len(frames), max_frames)
+    colors = 256
+    while True:
+        selected, selected_durations = _sample(count)
+        data = _encode(selected, selected_durations, colors)
+        if max_bytes is None or len(data) <= max_bytes or (count == 1 and colors <= 16):
+            break
+        # Too large: drop frames first, then colors
+        if count > 1:
+            count = max(1, count * 2 // 3)
+        else:
+            colors //= 2
+
+    _LOGGER.debug("Prepared %dx%d GIF with %d frames and %d colors: %d bytes",
+                  *selected[0].size, len(selected), colors, len(data))
+    if max_bytes is not None and len(data) > max_bytes:
+        _LOGGER.warning("Animation doesn't fit in %d bytes: %d bytes", max_bytes, len(data))
+    return data
+
+
+async def _async_read_response(resp: aiohttp.ClientResponse, max_bytes: int) -> bytes:
+    """Stream a response body, refusing anything over the byte cap."""
+    if resp.content_length is not None and resp.content_length > max_bytes:
+        raise HomeAssistantError(f"Image is too large ({resp.content_length} bytes, limit is {max_bytes})")
+
+    chunks = []
+    received = 0
+    async for chunk in resp.content.iter_chunked(64 * 1024):
+        received += len(chunk)
+        if received > max_bytes:
+            raise HomeAssistantError(f"Image is too large (over {max_bytes} bytes)")
+        chunks.append(chunk)
+    return b"".join(chunks)
+
+
+def resolve_local_path(hass: HomeAssistant, image_path: str) -> str:
+    """Map /config/... paths to the Home Assistant config directory."""
+    if image_path.startswith("/config/"):
+        return hass.config.path(image_path[8:])
+    return image_path
+
+
+async def async_prepare_image(
+    hass: HomeAssistant,
+    session: aiohttp.ClientSession,
+    cache: ImageCache,
+    image_path: str,
+    process: Callable[[bytes], bytes],
+    variant: tuple,
+    max_bytes: int = MAX_SOURCE_BYTES,
+) -> bytes:
+    """Fetch an image from a URL or local path and process it, reusing unchanged results.
+
+    ``variant`` identifies the processing (resize mode, size, encoding) in the cache key.
+    """
+    key = (image_path, *variant)
+    cached = cache.get(key)
+
+    if image_path.startswith("http"):
+        headers = {}
+        if cached is not None:
+            etag, last_modified = cached.validator
+            if etag:
+                headers["If-None-Match"] = etag
+            if last_modified:
+                headers["If-Modified-Since"] = last_modified
+
+        try:
+            async with session.get(image_path, headers=headers) as resp:
+                if resp.status == 304 and cached is not None:
+                    cache.record_hit(revalidated=True)
+                    return cached.data
+                if resp.status != 200:
+                    raise HomeAssistantError(f"Error fetching image from URL: {resp.status}")
+                # Without a validator the response can't be revalidated, so don't cache it
+                validator = (resp.headers.get("ETag"), resp.headers.get("Last-Modified"))
+                cacheable = any(validator)
+                image_data = await _async_read_response(resp, max_bytes)
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            raise HomeAssistantError(f"Error connecting to image URL: {e}") from e
+    else:
+        # Local file
+        actual_path = resolve_local_path(hass, image_path)
+
+        def _stat() -> tuple[int, int]:
+            stat = os.stat(actual_path)
+            return stat.st_mtime_ns, stat.st_size
+
+        def _read_file():
+            with open(actual_path, "rb") as f:
+                data = f.read(max_bytes + 1)
+            if len(data) > max_bytes:
+                raise HomeAssistantError(f"Image is too large (over {max_bytes} bytes)")
+            return data
+
+        try:
+            validator = await hass.async_add_executor_job(_stat)
+            if cached is not None and cached.validator == validator:
+                cache.record_hit()
+                return cached.data
+            cacheable = True
+            image_data = await hass.async_add_executor_job(_read_file)
+        except OSError as e:
+            raise HomeAssistantError(f"Error reading local image file: {e}") from e
+
+    if not image_data:
+        raise HomeAssistantError("Image is empty")
+
+    cache.record_miss()
+
+    # Resize image
+    try:
+        processed_data = await hass.async_add_executor_job(process, image_data)
+    except Exception as e:
+        raise HomeAssistantError(f"Error resizing image: {e}") from e
+
+    if cacheable:
+        cache.put(key, validator, processed_data)
+
+    return processed_data
@@ -0,0 +1,111 @@
+"""Request metrics for Geek Magic devices."""
+from __future__ import annotations
+
+import time
+from typing import Any
+
+# Upper bounds (ms) of the latency histogram buckets; the last bucket takes everything slower
+LATENCY_BUCKETS = (25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+class EndpointMetrics:
+    """Counters and a latency histogram for one endpoint."""
+
+    __slots__ = (
+        "requests", "errors", "timeouts", "retries", "bytes_sent", "bytes_received",
+        "total_latency", "max_latency", "last_latency", "buckets", "last_error", "last_error_at",
+    )
+
+    def __init__(self) -> None:
+        self.requests = 0
+        self.errors = 0
+        self.timeouts = 0
+        self.retries = 0
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.total_latency = 0.0
+        self.max_latency = 0.0
+        self.last_latency: float | None = None
+        self.buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.last_error: str | None = None
+        self.last_error_at: float | None = None
+
+    def record(self, latency: float, bytes_sent: int, bytes_received: int) -> None:
+        """Record a completed request."""
+        self.requests += 1
+        self.bytes_sent += bytes_sent
+        self.bytes_received += bytes_received
+        self.total_latency += latency
+        self.max_latency = max(self.max_latency, latency)
+        self.last_latency = latency
+
+        latency_ms = latency * 1000
+        for index, bound in enumerate(LATENCY_BUCKETS):
+            if latency_ms <= bound:
+                self.buckets[index] += 1
+                break
+        else:
+            self.buckets[-1] += 1
+
+    def record_error(self, error: BaseException, timeout: bool = False) -> None:
+        """Record a failed request."""
+        self.requests += 1
+        self.errors += 1
+        self.timeouts += timeout
+        self.last_error = f"{type(error).__name__}: {error}"
+        self.last_error_at = time.time()
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the metrics for diagnostics."""
+        completed = self.requests - self.errors
+        labels = [f"<={bound}ms" for bound in LATENCY_BUCKETS] + [f">{LATENCY_BUCKETS[-1]}ms"]
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "timeouts": self.timeouts,
+            "retries": self.retries,
+            "bytes_sent": self.bytes_sent,
+            "bytes_received": self.bytes_received,
+            "mean_latency_ms": round(self.total_latency / completed * 1000, 1) if completed else None,
+            "max_latency_ms": round(self.max_latency * 1000, 1),
+            "latency_histogram": dict(zip(labels, self.buckets)),
+            "last_error": self.last_error,
+            "last_error_at": self.last_error_at,
+        }
+
+
+class ClientMetrics:
+    """Per-endpoint request metrics of one device."""
+
+    def __init__(self) -> None:
+        """Initialize the metrics."""
+        self.endpoints: dict[str, EndpointMetrics] = {}
+        # Bytes per second of the last successful upload
+        self.last_upload_throughput: float | None = None
+        self.last_upload_bytes: int | None = None
+
+    def endpoint(self, name: str) -> EndpointMetrics:
+        """Return the metrics of an endpoint, creating them on first use."""
+        if (metrics := self.endpoints.get(name)) is None:
+            metrics = self.endpoints[name] = EndpointMetrics()
+        return metrics
+
+    @property
+    def requests(self) -> int:
+        """Return the number of requests to all endpoints."""
+        return sum(metrics.requests for metrics in self.endpoints.values())
+
+    @property
+    def errors(self) -> int:
+        """Return the number of failed requests to all endpoints."""
+        return sum(metrics.errors for metrics in self.endpoints.values())
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the metrics for diagnostics."""
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "last_upload_bytes": self.last_upload_bytes,
+            "last_upload_throughput": self.last_upload_throughput,
+            "endpoints": {name: metrics.as_dict() for name, metrics in sorted(self.endpoints.items())},
+        }
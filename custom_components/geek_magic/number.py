@@ -5,10 +5,10 @@ from homeassistant.components.number import NumberEntity, NumberMode
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import DOMAIN, CONF_UPDATE_INTERVAL, DEFAULT_UPDATE_INTERVAL
 from .coordinator import GeekMagicDataUpdateCoordinator
+from .entity import GeekMagicEntity
 
 
 async def async_setup_entry(
@@ -27,22 +27,9 @@ async def async_setup_entry(
     )
 
 
-class GeekMagicNumber(CoordinatorEntity, NumberEntity):
+class GeekMagicNumber(GeekMagicEntity, NumberEntity):
     """Base class for Geek Magic numbers."""
 
-    coordinator: GeekMagicDataUpdateCoordinator
-
-    def __init__(self, coordinator: GeekMagicDataUpdateCoordinator, entry: ConfigEntry) -> None:
-        """Initialize the entity."""
-        super().__init__(coordinator)
-        self._attr_has_entity_name = True
-        self._entry = entry
-        self._attr_device_info = {
-            "identifiers": {(DOMAIN, entry.entry_id)},
-            "name": entry.title,
-            "manufacturer": "Geek Magic",
-        }
-
 
 class GeekMagicBrightnessNumber(GeekMagicNumber):
     """Brightness number."""
@@ -53,6 +40,7 @@ class GeekMagicBrightnessNumber(GeekMagicNumber):
     _attr_native_max_value = 100
     _attr_native_step = 1
     _attr_icon = "mdi:brightness-percent"
+    _state_fields = frozenset({"brt"})
 
     @property
     def unique_id(self) -> str:
@@ -62,16 +50,13 @@ class GeekMagicBrightnessNumber(GeekMagicNumber):
     @property
     def native_value(self) -> float | None:
         """Return the current value."""
-        try:
-            return float(self.coordinator.data.get("brt"))
-        except (ValueError, TypeError):
-            return None
+        brt = self.coordinator.data.brt
+        return float(brt) if brt is not None else None
 
     async def async_set_native_value(self, value: float) -> None:
         """Set the value."""
         await self.coordinator.client.async_set_brightness(int(value))
-        self.coordinator.data["brt"] = int(value)
-        self.async_write_ha_state()
+        self.coordinator.async_update_state(brt=int(value))
 
 
 class GeekMagicUpdateIntervalNumber(GeekMagicNumber):
@@ -0,0 +1,164 @@
+"""Client for HTML render services."""
+from __future__ import annotations
+
+import asyncio
+import logging
+import re
+import time
+from typing import Any
+
+import aiohttp
+import async_timeout
+from homeassistant.exceptions import HomeAssistantError
+
+from .const import RENDER_TIMEOUT, RENDER_HEDGE_DELAY, CIRCUIT_FAILURES, CIRCUIT_COOLDOWN
+from .metrics import EndpointMetrics
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def parse_render_urls(value: str | None) -> list[str]:
+    """Return the render URLs of the option, in order of preference."""
+    return [url for url in re.split(r"[\s,]+", value or "") if url]
+
+
+class RenderBackend:
+    """A render service URL with a circuit breaker and request metrics.
+
+    After ``CIRCUIT_FAILURES`` failures in a row the backend is skipped for
+    ``CIRCUIT_COOLDOWN`` seconds; then one request is let through, and its
+    outcome closes the circuit or opens it again.
+    """
+
+    def __init__(self, url: str) -> None:
+        """Initialize the backend."""
+        self.url = url
+        self.metrics = EndpointMetrics()
+        self.failures = 0
+        self._opened_at: float | None = None
+
+    @property
+    def state(self) -> str:
+        """Return the circuit state: closed, open or half_open."""
+        if self._opened_at is None:
+            return "closed"
+        return "half_open" if time.monotonic() - self._opened_at >= CIRCUIT_COOLDOWN else "open"
+
+    def start(self) -> None:
+        """Note a request being sent; a half open circuit lets only this one through."""
+        if self.state == "half_open":
+            self._opened_at = time.monotonic()
+
+    def record_success(self, latency: float, bytes_sent: int, bytes_received: int) -> None:
+        """Record a rendered image, closing the circuit."""
+        self.metrics.record(latency, bytes_sent, bytes_received)
+        if self._opened_at is not None:
+            _LOGGER.info("Render service %s recovered", self.url)
+        self.failures = 0
+        self._opened_at = None
+
+    def record_failure(self, error: BaseException) -> None:
+        """Record a failed render, opening the circuit after too many in a row."""
+        self.metrics.record_error(error, timeout=isinstance(error, asyncio.TimeoutError))
+        self.failures += 1
+        if self.failures >= CIRCUIT_FAILURES:
+            if self._opened_at is None:
+                _LOGGER.warning("Render service %s failed %d times in a row, skipping it for %d seconds",
+                                self.url, self.failures, CIRCUIT_COOLDOWN)
+            self._opened_at = time.monotonic()
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the backend state for diagnostics."""
+        return {"state": self.state, "failures": self.failures, **self.metrics.as_dict()}
+
+
+class RenderClient:
+    """Renders HTML on the first render service that answers.
+
+    Each call has one deadline. The preferred service is asked first; when it
+    has not answered after ``RENDER_HEDGE_DELAY`` seconds, or has failed, the
+    next one is asked as well and the first image to arrive wins. Services with
+    an open circuit are skipped.
+    """
+
+    def __init__(self, session: aiohttp.ClientSession) -> None:
+        """Initialize the client."""
+        self._session = session
+        self._backends: dict[str, RenderBackend] = {}
+
+    def backend(self, url: str) -> RenderBackend:
+        """Return the backend of a URL, creating it on first use."""
+        if (backend := self._backends.get(url)) is None:
+            backend = self._backends[url] = RenderBackend(url)
+        return backend
+
+    @property
+    def stats(self) -> dict[str, Any]:
+        """Return the state of all backends used so far."""
+        return {url: backend.as_dict() for url, backend in self._backends.items()}
+
+    async def async_render(self, urls: list[str], html: str, cache: bool = True,
+                           timeout: float = RENDER_TIMEOUT) -> bytes:
+        """Render HTML to an image on one of the given services."""
+        if not urls:
+            raise HomeAssistantError("Render URL not configured for Geek Magic device")
+        candidates = map(self.backend, urls)
+
+        payload = {"html": html, "cache": "true" if cache else "false"}
+        pending: dict[asyncio.Task[bytes], RenderBackend] = {}
+        errors: list[str] = []
+
+        def _ask_next() -> bool:
+            for backend in candidates:
+                if backend.state != "open":
+                    backend.start()
+                    pending[asyncio.create_task(self._async_request(backend, payload))] = backend
+                    return True
+            return False
+
+        if not _ask_next():
+            raise HomeAssistantError(
+                f"All render services are failing, retrying them in up to {CIRCUIT_COOLDOWN} seconds"
+            )
+
+        try:
+            async with async_timeout.timeout(timeout):
+                while pending:
+                    done, _ = await asyncio.wait(pending, timeout=RENDER_HEDGE_DELAY,
+                                                 return_when=asyncio.FIRST_COMPLETED)
+                    if not done:
+                        # Slow to answer; ask the next service as well
+                        _ask_next()
+                        continue
+                    for task in done:
+                        del pending[task]
+                        if task.exception() is None:
+                            return task.result()
+                        errors.append(str(task.exception()))
+                    _ask_next()
+        except asyncio.TimeoutError as err:
+            errors.append(f"no image within {timeout} seconds")
+            for backend in pending.values():
+                backend.record_failure(err)
+        finally:
+            for task in pending:
+                task.cancel()
+
+        raise HomeAssistantError(f"Error rendering HTML: {'; '.join(errors)}")
+
+    async def _async_request(self, backend: RenderBackend, payload: dict[str, str]) -> bytes:
+        """Render on one service, recording the outcome."""
+        started = time.monotonic()
+        try:
+            async with self._session.post(backend.url, json=payload) as resp:
+                if resp.status != 200:
+                    raise HomeAssistantError(f"answered {resp.status}: {(await resp.text())[:200]}")
+                data = await resp.read()
+        except asyncio.CancelledError:
+            # Another service answered first
+            raise
+        except (aiohttp.ClientError, asyncio.TimeoutError, HomeAssistantError) as err:
+            backend.record_failure(err)
+            raise HomeAssistantError(f"{backend.url}: {str(err) or type(err).__name__}") from err
+        backend.record_success(time.monotonic() - started, len(payload["html"]), len(data))
+        return data
@@ -0,0 +1,160 @@
+"""Local renderer for the default subject/text template."""
+from __future__ import annotations
+
+import logging
+import re
+from functools import lru_cache
+
+from .const import DISPLAY_SIZE, DEFAULT_HTML_TEMPLATE
+from .image import encode_jpeg
+
+_LOGGER = logging.getLogger(__name__)
+
+# Layout of DEFAULT_HTML_TEMPLATE
+BACKGROUND = (0, 0, 0)
+SUBJECT_COLOR = (255, 165, 0)
+TEXT_COLOR = (255, 255, 255)
+SUBJECT_SIZE = 26
+TEXT_SIZE = 22
+MIN_TEXT_SIZE = 10
+SUBJECT_MARGIN = (10, 5)
+TEXT_MARGIN = 5
+SUBJECT_LINE_HEIGHT = 1.17
+TEXT_LINE_HEIGHT = 1.25
+
+FONT_CANDIDATES = {
+    False: ("Roboto-Regular.ttf", "DejaVuSans.ttf", "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf"),
+    True: ("Roboto-Bold.ttf", "DejaVuSans-Bold.ttf", "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf"),
+}
+
+# Markup, entities and emoji need a browser to look right
+_NEEDS_BROWSER = re.compile(r"[<>&]|[\u2600-\u27bf\ufe0f\U0001f000-\U0001faff]")
+
+# A private use code point no font maps, so it draws the font's missing glyph box
+_UNMAPPED_CHAR = "\U0010fffd"
+
+
+def can_render_locally(html_template: str, subject: str, text: str) -> bool:
+    """Return True if the local renderer produces the same layout as the render service."""
+    return (
+        html_template == DEFAULT_HTML_TEMPLATE
+        and not _NEEDS_BROWSER.search(f"{subject}{text}")
+        and all(_has_glyph(True, char) for char in set(subject))
+        and all(_has_glyph(False, char) for char in set(text))
+    )
+
+
+@lru_cache(maxsize=32)
+def _load_truetype(bold: bool, size: int):
+    """Load an installed TrueType font once per weight and size, or return None."""
+    from PIL import ImageFont
+
+    for candidate in FONT_CANDIDATES[bold]:
+        try:
+            return ImageFont.truetype(candidate, size)
+        except OSError:
+            continue
+    return None
+
+
+@lru_cache(maxsize=32)
+def _load_font(bold: bool, size: int):
+    """Load a font once per weight and size."""
+    if (font := _load_truetype(bold, size)) is not None:
+        return font
+
+    from PIL import ImageFont
+
+    _LOGGER.debug("No TrueType font found, using the Pillow default font")
+    return ImageFont.load_default(size)
+
+
+def _glyph(font, char: str) -> tuple[tuple[int, int], bytes]:
+    """Return the bitmap a font draws for a character."""
+    from PIL import Image, ImageDraw
+
+    left, top, right, bottom = font.getbbox(char)
+    img = Image.new("L", (max(1, right - left), max(1, bottom - top)))
+    ImageDraw.Draw(img).text((-left, -top), char, font=font, fill=255)
+    return img.size, img.tobytes()
+
+
+@lru_cache(maxsize=4096)
+def _has_glyph(bold: bool, char: str) -> bool:
+    """Return True if the installed font draws a character instead of a missing glyph box.
+
+    The Pillow default font covers Latin only, so without an installed font nothing is
+    rendered locally.
+    """
+    if (font := _load_truetype(bold, TEXT_SIZE)) is None:
+        return False
+    return char.isspace() or _glyph(font, char) != _glyph(font, _UNMAPPED_CHAR)
+
+
+@lru_cache(maxsize=4096)
+def _text_width(bold: bool, size: int, text: str) -> float:
+    """Measure text once per font."""
+    return _load_font(bold, size).getlength(text)
+
+
+def _wrap(text: str, bold: bool, size: int, width: int) -> list[str]:
+    """Wrap text into lines no wider than ``width``, breaking long words."""
+    lines: list[str] = []
+    line = ""
+    # Whitespace collapses like in HTML
+    for word in text.split():
+        candidate = f"{line} {word}" if line else word
+        if _text_width(bold, size, candidate) <= width:
+            line = candidate
+            continue
+
+        if line:
+            lines.append(line)
+        line = ""
+        # Break words that don't fit on a line of their own
+        for char in word:
+            if line and _text_width(bold, size, line + char) > width:
+                lines.append(line)
+                line = ""
+            line += char
+
+    if line:
+        lines.append(line)
+    return lines
+
+
+def render_text(subject: str, text: str, quality: int | None = None, max_bytes: int | None = None,
+                size: tuple[int, int] = DISPLAY_SIZE) -> bytes:
+    """Render subject and text the way DEFAULT_HTML_TEMPLATE lays them out, as a JPEG."""
+    from PIL import Image, ImageDraw
+
+    width, height = size
+    img = Image.new("RGB", size, BACKGROUND)
+    draw = ImageDraw.Draw(img)
+
+    y = SUBJECT_MARGIN[0]
+    subject_width = width - 2 * SUBJECT_MARGIN[1]
+    subject_step = round(SUBJECT_SIZE * SUBJECT_LINE_HEIGHT)
+    subject_lines = _wrap(subject, True, SUBJECT_SIZE, subject_width)
+    for line in subject_lines:
+        draw.text((width / 2, y + subject_step / 2), line, font=_load_font(True, SUBJECT_SIZE),
+                  fill=SUBJECT_COLOR, anchor="mm")
+        y += subject_step
+    y += SUBJECT_MARGIN[0]
+
+    # Shrink the text until it fits below the subject
+    text_width = width - 2 * TEXT_MARGIN
+    text_size = TEXT_SIZE
+    while True:
+        text_lines = _wrap(text, False, text_size, text_width)
+        text_step = round(text_size * TEXT_LINE_HEIGHT)
+        if y + len(text_lines) * text_step <= height or text_size <= MIN_TEXT_SIZE:
+            break
+        text_size -= 1
+
+    for line in text_lines:
+        draw.text((width / 2, y + text_step / 2), line, font=_load_font(False, text_size),
+                  fill=TEXT_COLOR, anchor="mm")
+        y += text_step
+
+    return encode_jpeg(img, quality, max_bytes)
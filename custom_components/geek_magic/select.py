@@ -3,30 +3,12 @@ from __future__ import annotations
 
 from homeassistant.components.select import SelectEntity
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import DOMAIN
 from .coordinator import GeekMagicDataUpdateCoordinator
-
-THEMES = {
-    "Weather Clock Today": 1,
-    "Weather Forecast": 2,
-    "Photo Album": 3,
-    "Time Style 1": 4,
-    "Time Style 2": 5,
-    "Time Style 3": 6,
-    "Simple Weather Clock": 7,
-}
-
-THEMES_AYDARIK = {
-    "Clock": 1,
-    "Message": 2,
-    "Image": 3,
-    "Countdown": 4,
-    "Big Clock": 5,
-}
+from .entity import GeekMagicEntity
 
 
 async def async_setup_entry(
@@ -42,37 +24,36 @@ async def async_setup_entry(
         GeekMagicImageSelect(coordinator, entry),
     ]
 
-    model = coordinator.data["m"]
-    if isinstance(model, str) and model != "aydarik":
+    if coordinator.data.has_small_images:
         entities.append(GeekMagicSmallImageSelect(coordinator, entry))
+    elif coordinator.data.model is None:
+        # The model is learned by the first refresh, which runs after setup
+        added = False
+
+        @callback
+        def _async_add_small_image_select() -> None:
+            nonlocal added
+            if not added and coordinator.data.has_small_images:
+                added = True
+                async_add_entities([GeekMagicSmallImageSelect(coordinator, entry)])
+
+        entry.async_on_unload(coordinator.async_add_listener(_async_add_small_image_select))
 
     async_add_entities(entities)
 
 
-class GeekMagicThemeSelect(CoordinatorEntity, SelectEntity):
+class GeekMagicThemeSelect(GeekMagicEntity, SelectEntity):
     """Theme select."""
 
     _attr_name = "Theme"
     _attr_unique_id = "theme"
     _attr_icon = "mdi:image-multiple"
-
-    def __init__(self, coordinator: GeekMagicDataUpdateCoordinator, entry: ConfigEntry) -> None:
-        """Initialize the entity."""
-        super().__init__(coordinator)
-        self._attr_has_entity_name = True
-        self._entry = entry
-        self._attr_device_info = {
-            "identifiers": {(DOMAIN, entry.entry_id)},
-            "name": entry.title,
-            "manufacturer": "Geek Magic",
-        }
+    _state_fields = frozenset({"theme", "model"})
 
     @property
     def options(self) -> list[str]:
-        model = self.coordinator.data.get("m")
-        if isinstance(model, str) and model == "aydarik":
-            return list(THEMES_AYDARIK.keys())
-        return list(THEMES.keys())
+        """Return allowed options."""
+        return self.coordinator.data.theme_options
 
     @property
     def unique_id(self) -> str:
@@ -82,54 +63,26 @@ class GeekMagicThemeSelect(CoordinatorEntity, SelectEntity):
     @property
     def current_option(self) -> str | None:
         """Return the current option."""
-        current_id = self.coordinator.data.get("theme")
-        try:
-            current_id = int(current_id)
-        except (ValueError, TypeError):
-            pass
-
-        model = self.coordinator.data.get("m")
-        if isinstance(model, str) and model == "aydarik":
-            for name, theme_id in THEMES_AYDARIK.items():
-                if theme_id == current_id:
-                    return name
-
-        for name, theme_id in THEMES.items():
-            if theme_id == current_id:
-                return name
-
-        return None
+        return self.coordinator.data.theme_option
 
     async def async_select_option(self, option: str) -> None:
         """Change the selected option."""
-        model = self.coordinator.data.get("m")
-        if isinstance(model, str) and model == "aydarik":
-            theme_id = THEMES_AYDARIK[option]
-        else:
-            theme_id = THEMES[option]
-
+        theme_id = self.coordinator.data.theme_id(option)
         await self.coordinator.client.async_set_theme(theme_id)
-        self.coordinator.data["theme"] = theme_id
-        self.async_write_ha_state()
+        self.coordinator.async_update_state(theme=theme_id)
 
 
-class GeekMagicImageSelect(CoordinatorEntity, SelectEntity):
+class GeekMagicImageSelect(GeekMagicEntity, SelectEntity):
     """Image select with local state tracking."""
 
     _attr_name = "Image"
     _attr_unique_id = "image_select"
     _attr_icon = "mdi:image-size-select-actual"
+    _state_fields = frozenset({"images"})
 
     def __init__(self, coordinator: GeekMagicDataUpdateCoordinator, entry: ConfigEntry) -> None:
         """Initialize the entity."""
-        super().__init__(coordinator)
-        self._attr_has_entity_name = True
-        self._entry = entry
-        self._attr_device_info = {
-            "identifiers": {(DOMAIN, entry.entry_id)},
-            "name": entry.title,
-            "manufacturer": "Geek Magic",
-        }
+        super().__init__(coordinator, entry)
         self._attr_current_option = None
 
     @property
@@ -140,38 +93,27 @@ class GeekMagicImageSelect(CoordinatorEntity, SelectEntity):
     @property
     def options(self) -> list[str]:
         """Return allowed options."""
-        return self.coordinator.data.get("images") or []
+        return list(self.coordinator.data.images)
 
     async def async_select_option(self, option: str) -> None:
         """Change the selected option."""
-        model = self.coordinator.data.get("m")
-        if isinstance(model, str) and model == "aydarik":
-            force_switch = False
-        else:
-            force_switch = True
-
-        await self.coordinator.client.async_set_image(option, None, force_switch)
+        await self.coordinator.client.async_set_image(option, None, not self.coordinator.data.is_aydarik)
+        self.coordinator.assets.async_shown(option)
         self._attr_current_option = option
         self.async_write_ha_state()
 
 
-class GeekMagicSmallImageSelect(CoordinatorEntity, SelectEntity):
+class GeekMagicSmallImageSelect(GeekMagicEntity, SelectEntity):
     """Small (Weather) Image select with local state tracking."""
 
     _attr_name = "Small Image"
     _attr_unique_id = "small_image_select"
     _attr_icon = "mdi:image-size-select-large"
+    _state_fields = frozenset({"small_images"})
 
     def __init__(self, coordinator: GeekMagicDataUpdateCoordinator, entry: ConfigEntry) -> None:
         """Initialize the entity."""
-        super().__init__(coordinator)
-        self._attr_has_entity_name = True
-        self._entry = entry
-        self._attr_device_info = {
-            "identifiers": {(DOMAIN, entry.entry_id)},
-            "name": entry.title,
-            "manufacturer": "Geek Magic",
-        }
+        super().__init__(coordinator, entry)
         self._attr_current_option = None
 
     @property
@@ -182,7 +124,7 @@ class GeekMagicSmallImageSelect(CoordinatorEntity, SelectEntity):
     @property
     def options(self) -> list[str]:
         """Return allowed options."""
-        return self.coordinator.data.get("small_images") or []
+        return list(self.coordinator.data.small_images)
 
     async def async_select_option(self, option: str) -> None:
         """Change the selected option."""
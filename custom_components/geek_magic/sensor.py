@@ -1,15 +1,15 @@
 """Sensor entities for Geek Magic."""
 from __future__ import annotations
 
-from homeassistant.components.sensor import SensorEntity, SensorStateClass
+from homeassistant.components.sensor import SensorDeviceClass, SensorEntity, SensorStateClass
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import UnitOfInformation
-from homeassistant.core import HomeAssistant
+from homeassistant.const import EntityCategory, UnitOfDataRate, UnitOfInformation, UnitOfTime
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import DOMAIN
 from .coordinator import GeekMagicDataUpdateCoordinator
+from .entity import GeekMagicEntity
 
 
 async def async_setup_entry(
@@ -23,11 +23,14 @@ async def async_setup_entry(
     async_add_entities(
         [
             GeekMagicFreeSpaceSensor(coordinator, entry),
+            GeekMagicPollDurationSensor(coordinator, entry),
+            GeekMagicUploadThroughputSensor(coordinator, entry),
+            GeekMagicFailedRequestsSensor(coordinator, entry),
         ]
     )
 
 
-class GeekMagicFreeSpaceSensor(CoordinatorEntity, SensorEntity):
+class GeekMagicFreeSpaceSensor(GeekMagicEntity, SensorEntity):
     """Free space sensor."""
 
     _attr_name = "Free Space"
@@ -35,17 +38,7 @@ class GeekMagicFreeSpaceSensor(CoordinatorEntity, SensorEntity):
     _attr_native_unit_of_measurement = UnitOfInformation.KILOBYTES
     _attr_state_class = SensorStateClass.MEASUREMENT
     _attr_icon = "mdi:sd"
-
-    def __init__(self, coordinator: GeekMagicDataUpdateCoordinator, entry: ConfigEntry) -> None:
-        """Initialize the entity."""
-        super().__init__(coordinator)
-        self._attr_has_entity_name = True
-        self._entry = entry
-        self._attr_device_info = {
-            "identifiers": {(DOMAIN, entry.entry_id)},
-            "name": entry.title,
-            "manufacturer": "Geek Magic",
-        }
+    _state_fields = frozenset({"free"})
 
     @property
     def unique_id(self) -> str:
@@ -55,11 +48,92 @@ class GeekMagicFreeSpaceSensor(CoordinatorEntity, SensorEntity):
     @property
     def native_value(self) -> float | None:
         """Return the current value."""
-        bytes_val = self.coordinator.data.get("free")
-        if bytes_val is not None:
-            try:
-                # Convert bytes to KB
-                return round(int(bytes_val) / 1024, 2)
-            except (ValueError, TypeError):
-                pass
-        return None
+        free = self.coordinator.data.free
+        # Convert bytes to KB
+        return round(free / 1024, 2) if free is not None else None
+
+
+class GeekMagicMetricSensor(GeekMagicEntity, SensorEntity):
+    """Base class for diagnostic sensors showing request metrics."""
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+    _written_value: float | int | None = None
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write state when the measured value or availability changed."""
+        if self.available == self._written_available and self.native_value == self._written_value:
+            return
+        self.async_write_ha_state()
+
+    @callback
+    def async_write_ha_state(self) -> None:
+        """Write the state, remembering the value it was written with."""
+        self._written_value = self.native_value
+        super().async_write_ha_state()
+
+
+class GeekMagicPollDurationSensor(GeekMagicMetricSensor):
+    """Duration of the last refresh."""
+
+    _attr_name = "Last Poll Duration"
+    _attr_unique_id = "last_poll_duration"
+    _attr_native_unit_of_measurement = UnitOfTime.SECONDS
+    _attr_device_class = SensorDeviceClass.DURATION
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_suggested_display_precision = 2
+    _attr_icon = "mdi:timer-sand"
+
+    @property
+    def unique_id(self) -> str:
+        """Return unique ID."""
+        return f"{self._entry.entry_id}_last_poll_duration"
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the current value."""
+        duration = self.coordinator.last_update_duration
+        return round(duration, 3) if duration is not None else None
+
+
+class GeekMagicUploadThroughputSensor(GeekMagicMetricSensor):
+    """Throughput of the last upload."""
+
+    _attr_name = "Last Upload Throughput"
+    _attr_unique_id = "last_upload_throughput"
+    _attr_native_unit_of_measurement = UnitOfDataRate.KILOBYTES_PER_SECOND
+    _attr_device_class = SensorDeviceClass.DATA_RATE
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_icon = "mdi:upload-network"
+
+    @property
+    def unique_id(self) -> str:
+        """Return unique ID."""
+        return f"{self._entry.entry_id}_last_upload_throughput"
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the current value."""
+        throughput = self.coordinator.client.metrics.last_upload_throughput
+        # Convert bytes/s to KB/s
+        return round(throughput / 1024, 1) if throughput is not None else None
+
+
+class GeekMagicFailedRequestsSensor(GeekMagicMetricSensor):
+    """Number of failed requests since start."""
+
+    _attr_name = "Failed Requests"
+    _attr_unique_id = "failed_requests"
+    _attr_state_class = SensorStateClass.TOTAL_INCREASING
+    _attr_icon = "mdi:lan-disconnect"
+
+    @property
+    def unique_id(self) -> str:
+        """Return unique ID."""
+        return f"{self._entry.entry_id}_failed_requests"
+
+    @property
+    def native_value(self) -> int:
+        """Return the current value."""
+        return self.coordinator.client.metrics.errors
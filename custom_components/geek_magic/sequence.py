@@ -0,0 +1,174 @@
+"""Render-ahead frame sequences for Geek Magic devices."""
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections.abc import Awaitable, Callable
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN, PREPROCESS_PARALLEL, DEFAULT_SEQUENCE_LOOKAHEAD
+
+if TYPE_CHECKING:
+    from .coordinator import GeekMagicDataUpdateCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class Frame:
+    """HTML to show from a point in time (Unix timestamp) on."""
+
+    __slots__ = ("html", "due")
+
+    def __init__(self, html: str, due: float) -> None:
+        self.html = html
+        self.due = due
+
+
+class FrameSequence:
+    """Shows a sequence of rendered frames, each at its due time.
+
+    Frames are rendered in parallel and uploaded ahead of time, at most
+    ``lookahead`` frames beyond the one on screen, into a ring of
+    ``lookahead + 1`` device files. The switch at the due time is then a single
+    ``/set?img=`` call, and a sequence never uses more than that many files.
+    """
+
+    def __init__(self, hass: HomeAssistant, coordinator: GeekMagicDataUpdateCoordinator) -> None:
+        """Initialize the sequence."""
+        self._hass = hass
+        self._coordinator = coordinator
+        self._task: asyncio.Task | None = None
+        self._lock = asyncio.Lock()
+        # Device files of the ring, kept after the sequence ends so the next one reuses them
+        self.filenames: list[str] = []
+        self.position: int | None = None
+        self.total = 0
+        self.late = 0
+
+    @property
+    def running(self) -> bool:
+        """Return True if frames are still to be shown."""
+        return self._task is not None and not self._task.done()
+
+    async def async_play(self, frames: list[Frame], render: Callable[[str], Awaitable[bytes]],
+                         filename: str = "sequence",
+                         lookahead: int = DEFAULT_SEQUENCE_LOOKAHEAD) -> dict[str, Any]:
+        """Replace the running sequence with new frames, ordered by due time.
+
+        Of the frames already due, only the last one is shown.
+        """
+        async with self._lock:
+            await self.async_shutdown()
+
+            now = time.time()
+            first = max((index for index, frame in enumerate(frames) if frame.due <= now), default=0)
+            frames = frames[first:]
+
+            # Start the ring after the file on screen, so it is overwritten last
+            ring = [f"{filename}_{slot}.jpg" for slot in range(min(lookahead + 1, len(frames)))]
+            if (shown := self._coordinator.assets.shown) in ring:
+                start = ring.index(shown) + 1
+                ring = ring[start:] + ring[:start]
+            self.filenames = ring
+            self.position = None
+            self.total = len(frames)
+            self.late = 0
+
+            self._task = self._hass.async_create_background_task(
+                self._async_run(frames, render, lookahead), f"{DOMAIN} sequence {self._coordinator.client.url}"
+            )
+            return {
+                "frames": len(frames),
+                "filenames": list(ring),
+                "last_frame_at": datetime.fromtimestamp(frames[-1].due, timezone.utc).isoformat(),
+            }
+
+    async def async_stop(self, clear: bool = False) -> dict[str, Any]:
+        """Stop showing frames, optionally deleting the frame files from the device."""
+        async with self._lock:
+            await self.async_shutdown()
+            removed: list[str] = []
+            if clear:
+                removed, self.filenames = self.filenames, []
+                for filename in removed:
+                    try:
+                        await self._coordinator.client.async_delete_image(filename)
+                    except Exception as e:  # pylint: disable=broad-except
+                        _LOGGER.warning("Error deleting frame %s from %s: %s",
+                                        filename, self._coordinator.client.url, e)
+                        continue
+                    self._coordinator.assets.async_forget(filename)
+            return {"removed": removed}
+
+    async def async_shutdown(self) -> None:
+        """Stop showing frames."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _async_run(self, frames: list[Frame], render: Callable[[str], Awaitable[bytes]],
+                         lookahead: int) -> None:
+        """Show frames at their due times while the next ones are rendered and uploaded."""
+        loop = asyncio.get_running_loop()
+        # Due times are wall clock; sleep on the loop clock
+        offset = loop.time() - time.time()
+        semaphore = asyncio.Semaphore(PREPROCESS_PARALLEL)
+        shown = asyncio.Event()
+        ready: list[asyncio.Future[str | None]] = [loop.create_future() for _ in frames]
+        renders: dict[int, asyncio.Task[bytes]] = {}
+
+        async def _render(frame: Frame) -> bytes:
+            async with semaphore:
+                return await render(frame.html)
+
+        async def _upload_ahead() -> None:
+            for index, frame in enumerate(frames):
+                for ahead in range(index, min(len(frames), index + lookahead + 1)):
+                    if ahead not in renders:
+                        renders[ahead] = asyncio.create_task(_render(frames[ahead]))
+
+                # Don't overwrite the file on screen
+                while index - (-1 if self.position is None else self.position) > lookahead:
+                    shown.clear()
+                    await shown.wait()
+
+                try:
+                    data = await renders.pop(index)
+                    filename, _ = await self._coordinator.assets.async_upload(
+                        data, self.filenames[index % len(self.filenames)]
+                    )
+                except Exception as e:  # pylint: disable=broad-except
+                    _LOGGER.warning("Error preparing frame %d for %s: %s", index, self._coordinator.client.url, e)
+                    ready[index].set_result(None)
+                else:
+                    ready[index].set_result(filename)
+
+        uploader = asyncio.create_task(_upload_ahead())
+        try:
+            for index, frame in enumerate(frames):
+                await asyncio.sleep(max(0.0, frame.due + offset - loop.time()))
+                if not ready[index].done():
+                    self.late += 1
+                    _LOGGER.debug("Frame %d for %s is not uploaded at its due time", index,
+                                  self._coordinator.client.url)
+                if (filename := await ready[index]) is not None:
+                    try:
+                        force_switch = self.position is None and not self._coordinator.data.is_aydarik
+                        await self._coordinator.client.async_set_image(filename, None, force_switch)
+                        self._coordinator.assets.async_shown(filename)
+                    except Exception as e:  # pylint: disable=broad-except
+                        _LOGGER.warning("Error showing frame %d on %s: %s", index, self._coordinator.client.url, e)
+                self.position = index
+                shown.set()
+        finally:
+            uploader.cancel()
+            for task in renders.values():
+                task.cancel()
@@ -0,0 +1,238 @@
+"""Host-driven slideshows for Geek Magic devices."""
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN
+
+if TYPE_CHECKING:
+    from .coordinator import GeekMagicDataUpdateCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+
+
+class Slide:
+    """A file on the device and how long it is shown."""
+
+    __slots__ = ("filename", "duration")
+
+    def __init__(self, filename: str, duration: float) -> None:
+        self.filename = filename
+        self.duration = duration
+
+
+class Slideshow:
+    """Rotates images already uploaded to a device on a schedule kept by Home Assistant.
+
+    Slides are stored under content-derived filenames, so changing the playlist
+    uploads only new content and deletes only files no longer used. Each tick
+    is a single ``/set?img=`` call, scheduled against absolute deadlines so
+    the request time does not add up into drift.
+    """
+
+    def __init__(self, hass: HomeAssistant, coordinator: GeekMagicDataUpdateCoordinator) -> None:
+        """Initialize the slideshow."""
+        self._hass = hass
+        self._coordinator = coordinator
+        self._store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.{coordinator.config_entry.entry_id}.slideshow"
+        )
+        self._slides: list[Slide] = []
+        self._shuffle = False
+        self._task: asyncio.Task | None = None
+        self._lock = asyncio.Lock()
+        self._needs_switch = False
+        # The restored playlist was running and waits for the first refresh to resume
+        self._resume = False
+        self.current: str | None = None
+
+    @property
+    def running(self) -> bool:
+        """Return True if the slideshow is rotating slides."""
+        return self._task is not None and not self._task.done()
+
+    @property
+    def filenames(self) -> list[str]:
+        """Return the device filenames of the playlist."""
+        return [slide.filename for slide in self._slides]
+
+    async def async_load(self) -> None:
+        """Restore the last playlist."""
+        if (stored := await self._store.async_load()) is None:
+            return
+
+        self._slides = [Slide(filename, duration) for filename, duration in stored.get("slides", [])]
+        self._shuffle = stored.get("shuffle", False)
+        self._resume = bool(stored.get("running"))
+
+    async def async_resume(self) -> None:
+        """Resume the restored playlist if it was running, once the device's images are known."""
+        async with self._lock:
+            if not self._resume:
+                return
+            self._resume = False
+
+            # Only resume with slides the device still holds
+            images = self._coordinator.data.images
+            slides = [slide for slide in self._slides if slide.filename in images]
+            if slides:
+                self._slides = slides
+                await self._async_start()
+
+    async def async_set_playlist(self, slides: list[tuple[bytes, str, float]],
+                                 shuffle: bool = False) -> dict[str, Any]:
+        """Upload the changed slides, start rotating them and delete files no longer used.
+
+        ``slides`` holds (content, extension, duration) tuples in playlist order.
+        """
+        async with self._lock:
+            previous = set(self.filenames)
+            playlist: list[Slide] = []
+            uploaded = 0
+            for data, extension, duration in slides:
+                filename, was_uploaded = await self._coordinator.assets.async_upload(
+                    data, f"slide.{extension}", content_addressed=True
+                )
+                uploaded += was_uploaded
+                playlist.append(Slide(filename, duration))
+
+            # Keep showing the old playlist until the new one is on the device
+            self._resume = False
+            await self._async_cancel()
+            self._slides = playlist
+            self._shuffle = shuffle
+            await self._async_start()
+
+            removed = previous - set(self.filenames)
+            await self._async_delete(removed)
+
+            return {
+                "slides": self.filenames,
+                "uploaded": uploaded,
+                "removed": sorted(removed),
+            }
+
+    async def async_stop(self, clear: bool = False) -> dict[str, Any]:
+        """Stop rotating slides, optionally deleting them from the device."""
+        async with self._lock:
+            self._resume = False
+            await self._async_cancel()
+            removed: set[str] = set()
+            if clear:
+                removed = set(self.filenames)
+                self._slides = []
+                await self._async_delete(removed)
+            self._async_save()
+            return {"removed": sorted(removed)}
+
+    async def async_shutdown(self) -> None:
+        """Stop the rotation without forgetting that it was running."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _async_start(self) -> None:
+        """Show the first slide and schedule the rest."""
+        if not self._slides:
+            self._async_save()
+            return
+
+        order = self._order()
+        # Switch the device to the album once, later ticks only change the image
+        self._needs_switch = True
+        try:
+            await self._async_show(order[0])
+        except Exception as e:  # pylint: disable=broad-except
+            _LOGGER.warning("Error showing slide %s on %s: %s", order[0].filename, self._coordinator.client.url, e)
+        if len(self._slides) > 1:
+            self._task = self._hass.async_create_background_task(
+                self._async_run(order), f"{DOMAIN} slideshow {self._coordinator.client.url}"
+            )
+        self._async_save()
+
+    async def _async_cancel(self) -> None:
+        """Stop the rotation task."""
+        await self.async_shutdown()
+        self.current = None
+
+    async def _async_run(self, order: list[Slide]) -> None:
+        """Show slides at their deadlines, reshuffling after every round."""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time()
+        index = 0
+        while True:
+            deadline += order[index].duration
+            index += 1
+            if index == len(order):
+                order = self._order(order[-1])
+                index = 0
+
+            await asyncio.sleep(max(0.0, deadline - loop.time()))
+            if loop.time() - deadline > order[index].duration:
+                # Fell more than a slide behind (device offline), restart the schedule from now
+                deadline = loop.time()
+
+            if not self._coordinator.last_update_success:
+                # Don't queue requests to an unreachable device, the schedule just continues
+                continue
+            try:
+                await self._async_show(order[index])
+            except Exception as e:  # pylint: disable=broad-except
+                _LOGGER.warning("Error showing slide %s on %s: %s",
+                                order[index].filename, self._coordinator.client.url, e)
+
+    async def _async_show(self, slide: Slide) -> None:
+        force_switch = self._needs_switch and not self._coordinator.data.is_aydarik
+        await self._coordinator.client.async_set_image(slide.filename, None, force_switch)
+        self._coordinator.assets.async_shown(slide.filename)
+        self._needs_switch = False
+        self.current = slide.filename
+
+    def _order(self, last: Slide | None = None) -> list[Slide]:
+        """Return the order of the next round."""
+        if not self._shuffle:
+            return list(self._slides)
+
+        order = random.sample(self._slides, len(self._slides))
+        if last is not None and len(order) > 1 and order[0] is last:
+            # Don't show the same slide twice in a row across rounds
+            order[0], order[-1] = order[-1], order[0]
+        return order
+
+    async def _async_delete(self, filenames: set[str]) -> None:
+        """Delete slides from the device."""
+        for filename in sorted(filenames):
+            try:
+                await self._coordinator.client.async_delete_image(filename)
+            except Exception as e:  # pylint: disable=broad-except
+                _LOGGER.warning("Error deleting slide %s from %s: %s", filename, self._coordinator.client.url, e)
+                continue
+            self._coordinator.assets.async_forget(filename)
+
+    async def async_save(self) -> None:
+        """Write the playlist now instead of after the save delay."""
+        await self._store.async_save(self._data_to_save())
+
+    @callback
+    def _async_save(self) -> None:
+        self._store.async_delay_save(self._data_to_save, 1)
+
+    @callback
+    def _data_to_save(self) -> dict[str, Any]:
+        return {
+            "slides": [[slide.filename, slide.duration] for slide in self._slides],
+            "shuffle": self._shuffle,
+            "running": self._resume or self.running or (len(self._slides) == 1 and self.current is not None),
+        }
@@ -0,0 +1,112 @@
+"""Device state snapshots for Geek Magic."""
+from __future__ import annotations
+
+from typing import Any
+
+THEMES = {
+    "Weather Clock Today": 1,
+    "Weather Forecast": 2,
+    "Photo Album": 3,
+    "Time Style 1": 4,
+    "Time Style 2": 5,
+    "Time Style 3": 6,
+    "Simple Weather Clock": 7,
+}
+
+THEMES_AYDARIK = {
+    "Clock": 1,
+    "Message": 2,
+    "Image": 3,
+    "Countdown": 4,
+    "Big Clock": 5,
+}
+
+# Reverse lookups and option lists, built once
+THEME_NAMES = {theme_id: name for name, theme_id in THEMES.items()}
+THEME_NAMES_AYDARIK = {theme_id: name for name, theme_id in THEMES_AYDARIK.items()}
+THEME_OPTIONS = list(THEMES)
+THEME_OPTIONS_AYDARIK = list(THEMES_AYDARIK)
+
+FIELDS = ("theme", "brt", "model", "free", "images", "small_images")
+
+
+def _as_int(value: Any) -> int | None:
+    try:
+        return int(value)
+    except (ValueError, TypeError):
+        return None
+
+
+class DeviceState:
+    """Immutable snapshot of what a device reported.
+
+    Values are normalized on construction, so equal device state compares equal
+    and ``changes`` can tell which fields differ between two polls.
+    """
+
+    __slots__ = (*FIELDS, "is_aydarik", "theme_option")
+
+    theme: int | None
+    brt: int | None
+    model: str | None
+    free: int | None
+    images: tuple[str, ...]
+    small_images: tuple[str, ...]
+    is_aydarik: bool
+    theme_option: str | None
+
+    def __init__(self, theme: Any = None, brt: Any = None, model: Any = None, free: Any = None,
+                 images: Any = (), small_images: Any = ()) -> None:
+        """Initialize the snapshot."""
+        model = model if isinstance(model, str) else None
+        is_aydarik = model == "aydarik"
+        theme = _as_int(theme)
+        names = THEME_NAMES_AYDARIK if is_aydarik else THEME_NAMES
+
+        set_field = object.__setattr__
+        set_field(self, "theme", theme)
+        set_field(self, "brt", _as_int(brt))
+        set_field(self, "model", model)
+        set_field(self, "free", _as_int(free))
+        set_field(self, "images", tuple(images or ()))
+        set_field(self, "small_images", tuple(small_images or ()))
+        set_field(self, "is_aydarik", is_aydarik)
+        set_field(self, "theme_option", names.get(theme))
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, DeviceState):
+            return NotImplemented
+        return all(getattr(self, field) == getattr(other, field) for field in FIELDS)
+
+    def __hash__(self) -> int:
+        return hash(tuple(getattr(self, field) for field in FIELDS))
+
+    def __repr__(self) -> str:
+        return f"DeviceState({', '.join(f'{field}={getattr(self, field)!r}' for field in FIELDS)})"
+
+    @property
+    def theme_options(self) -> list[str]:
+        """Return the theme names the firmware supports."""
+        return THEME_OPTIONS_AYDARIK if self.is_aydarik else THEME_OPTIONS
+
+    @property
+    def has_small_images(self) -> bool:
+        """Return True if the firmware has the small (weather) image slot."""
+        return self.model is not None and not self.is_aydarik
+
+    def theme_id(self, option: str) -> int:
+        """Return the theme ID for a theme name."""
+        return (THEMES_AYDARIK if self.is_aydarik else THEMES)[option]
+
+    def replace(self, **changes: Any) -> DeviceState:
+        """Return a copy with some fields changed."""
+        return DeviceState(**{field: changes.get(field, getattr(self, field)) for field in FIELDS})
+
+    def changes(self, previous: DeviceState | None) -> frozenset[str]:
+        """Return the names of the fields that differ from a previous snapshot."""
+        if previous is None:
+            return frozenset(FIELDS)
+        return frozenset(field for field in FIELDS if getattr(self, field) != getattr(previous, field))
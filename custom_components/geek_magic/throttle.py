@@ -0,0 +1,54 @@
+"""Rate limiting of content sent to Geek Magic devices."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+
+class LatestWinsThrottle:
+    """Delivers content to a device at most once per interval, dropping stale calls.
+
+    A call made while the device is idle and the interval has passed is
+    delivered at once. Calls arriving sooner wait for the interval to pass
+    (and for a delivery in progress to finish); a newer call replaces the
+    waiting one, so after a burst only the latest content is delivered.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the throttle."""
+        self._lock = asyncio.Lock()
+        self._waiter: asyncio.Future[None] | None = None
+        self._last = float("-inf")
+        self.dropped = 0
+
+    def _supersede(self) -> None:
+        """Drop the call waiting for its turn, if any."""
+        if self._waiter is not None and not self._waiter.done():
+            self._waiter.set_result(None)
+            self.dropped += 1
+        self._waiter = None
+
+    async def async_run(self, min_interval: float | None,
+                        action: Callable[[], Awaitable[dict[str, Any]]]) -> dict[str, Any]:
+        """Deliver through ``action`` unless a newer call supersedes this one first.
+
+        Without ``min_interval`` the action runs right away, still dropping a
+        waiting throttled call so it cannot overwrite newer content later.
+        """
+        self._supersede()
+        if not min_interval:
+            return await action()
+
+        loop = asyncio.get_running_loop()
+        self._waiter = waiter = loop.create_future()
+        async with self._lock:
+            delay = self._last + min_interval - loop.time()
+            if delay > 0 and not waiter.done():
+                await asyncio.wait({waiter}, timeout=delay)
+            if waiter.done():
+                return {"dropped": True}
+
+            self._waiter = None
+            self._last = loop.time()
+            return await action()
@@ -0,0 +1,240 @@
+"""Tests for the device transport and command queue."""
+import asyncio
+import contextlib
+
+import pytest
+
+from custom_components.geek_magic import api
+from custom_components.geek_magic.api import (
+    PRIORITY_BACKGROUND,
+    PRIORITY_USER,
+    GeekMagicCommandQueue,
+    GeekMagicTransport,
+    GeekMagicTransportError,
+)
+
+OK = b"HTTP/1.1 200 OK\r\nContent-Length: 2\r\n\r\nok"
+
+
+async def _read_request(reader: asyncio.StreamReader) -> bytes:
+    """Read the head of a request without a body, or return b"" when the client is gone."""
+    head = b""
+    while (line := await reader.readline()) not in (b"\r\n", b""):
+        head += line
+    return head
+
+
+@contextlib.asynccontextmanager
+async def _device(*responses: bytes, close_after: int | None = None):
+    """Serve the responses in order, at most ``close_after`` per connection before dropping it.
+
+    Yields the list of request counts per connection.
+    """
+    queued = list(responses)
+    connections: list[int] = []
+
+    async def _handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        index = len(connections)
+        connections.append(0)
+        try:
+            while await _read_request(reader):
+                if close_after is not None and connections[index] >= close_after:
+                    # Drop the kept-alive connection without answering, like the firmware does
+                    return
+                connections[index] += 1
+                response = queued.pop(0)
+                writer.write(response)
+                await writer.drain()
+                if b"Content-Length" not in response and b"chunked" not in response:
+                    # The body ends with the connection
+                    return
+        finally:
+            writer.close()
+
+    server = await asyncio.start_server(_handle, "127.0.0.1", 0)
+    host, port = server.sockets[0].getsockname()[:2]
+    transport = GeekMagicTransport(f"http://{host}:{port}")
+    try:
+        yield transport, connections
+    finally:
+        await transport.async_close()
+        server.close()
+        await server.wait_closed()
+
+
+def _request(*responses: bytes) -> tuple[int, bytes]:
+    """Send one GET request to a device answering with the given response."""
+    async def _run() -> tuple[int, bytes]:
+        async with _device(*responses) as (transport, _):
+            return await transport.request("get", "app.json")
+
+    return asyncio.run(_run())
+
+
+def test_duplicate_identical_content_length():
+    """The firmware repeats the Content-Length header."""
+    response = b"HTTP/1.1 200 OK\r\nContent-Length: 5\r\nContent-Length: 5\r\n\r\nhello"
+    assert _request(response) == (200, b"hello")
+
+
+def test_conflicting_content_length_is_rejected():
+    """Lengths that disagree make the body boundary ambiguous."""
+    response = b"HTTP/1.1 200 OK\r\nContent-Length: 5\r\nContent-Length: 7\r\n\r\nhello"
+    with pytest.raises(GeekMagicTransportError, match="Conflicting Content-Length"):
+        _request(response)
+
+
+def test_chunked_body():
+    """Chunks are joined and trailers skipped."""
+    response = (b"HTTP/1.1 200 OK\r\nTransfer-Encoding: chunked\r\n\r\n"
+                b"5\r\nhello\r\n6;ext=1\r\n world\r\n0\r\nX-Trailer: 1\r\n\r\n")
+    assert _request(response) == (200, b"hello world")
+
+
+def test_body_read_until_close():
+    """Without a length, the body ends when the device closes the connection."""
+    async def _run() -> None:
+        async with _device(b"HTTP/1.0 200 OK\r\n\r\nuntil close", OK) as (transport, connections):
+            assert await transport.request("get", "filelist") == (200, b"until close")
+            # The connection is not reused
+            assert await transport.request("get", "app.json") == (200, b"ok")
+            assert connections == [1, 1]
+
+    asyncio.run(_run())
+
+
+def test_stale_keep_alive_connection_is_retried_once():
+    """A kept-alive connection the device dropped is replaced by a fresh one."""
+    async def _run() -> None:
+        async with _device(OK, OK, close_after=1) as (transport, connections):
+            assert await transport.request("get", "app.json") == (200, b"ok")
+            assert await transport.request("get", "brt.json") == (200, b"ok")
+            assert connections == [1, 1]
+
+    asyncio.run(_run())
+
+
+def test_fresh_connection_closed_is_an_error():
+    """Only reused connections are retried, so a device that never answers fails the request."""
+    async def _run() -> None:
+        async with _device(close_after=0) as (transport, connections):
+            with pytest.raises(ConnectionError):
+                await transport.request("get", "app.json")
+            assert connections == [0]
+
+    asyncio.run(_run())
+
+
+def test_idle_connection_expires(monkeypatch):
+    """Connections idle longer than the firmware keeps them are not reused."""
+    monkeypatch.setattr(api, "KEEPALIVE_IDLE_TIMEOUT", 0.1)
+
+    async def _run() -> None:
+        async with _device(OK, OK, OK) as (transport, connections):
+            await transport.request("get", "app.json")
+            await transport.request("get", "app.json")
+            assert connections == [2]
+
+            await asyncio.sleep(0.2)
+            await transport.request("get", "app.json")
+            assert connections == [2, 1]
+
+    asyncio.run(_run())
+
+
+class _Commands:
+    """Records which commands a queue runs, holding the first one until released."""
+
+    def __init__(self) -> None:
+        self.ran: list[str] = []
+        self.release = asyncio.Event()
+
+    def __call__(self, name: str, result=None):
+        async def _factory():
+            self.ran.append(name)
+            if name == "busy":
+                await self.release.wait()
+            return result if result is not None else name
+
+        return _factory
+
+
+async def _busy_queue(commands: _Commands) -> tuple[GeekMagicCommandQueue, asyncio.Task]:
+    """Return a queue whose only slot is taken until ``commands.release`` is set."""
+    queue = GeekMagicCommandQueue(max_in_flight=1)
+    busy = asyncio.create_task(queue.submit(commands("busy")))
+    await asyncio.sleep(0)
+    return queue, busy
+
+
+def test_queue_coalesces_keyed_commands():
+    """Only the latest queued value is sent, and every caller gets its result."""
+    async def _run() -> None:
+        commands = _Commands()
+        queue, busy = await _busy_queue(commands)
+        first = asyncio.create_task(queue.submit(commands("brt 10", 10), key="set:brt"))
+        second = asyncio.create_task(queue.submit(commands("brt 20", 20), key="set:brt"))
+        await asyncio.sleep(0)
+
+        commands.release.set()
+        assert await asyncio.gather(busy, first, second) == ["busy", 20, 20]
+        assert commands.ran == ["busy", "brt 20"]
+
+    asyncio.run(_run())
+
+
+def test_queue_runs_user_commands_first():
+    """Queued user commands overtake queued background polls."""
+    async def _run() -> None:
+        commands = _Commands()
+        queue, busy = await _busy_queue(commands)
+        tasks = [
+            asyncio.create_task(queue.submit(commands("poll"), priority=PRIORITY_BACKGROUND)),
+            asyncio.create_task(queue.submit(commands("space"), priority=PRIORITY_BACKGROUND)),
+            asyncio.create_task(queue.submit(commands("command"), priority=PRIORITY_USER)),
+        ]
+        await asyncio.sleep(0)
+
+        commands.release.set()
+        await asyncio.gather(busy, *tasks)
+        assert commands.ran == ["busy", "command", "poll", "space"]
+
+    asyncio.run(_run())
+
+
+def test_queue_drops_cancelled_command_before_it_starts():
+    """A command nobody waits for any more never reaches the device."""
+    async def _run() -> None:
+        commands = _Commands()
+        queue, busy = await _busy_queue(commands)
+        cancelled = asyncio.create_task(queue.submit(commands("cancelled"), key="set:img"))
+        await asyncio.sleep(0)
+        cancelled.cancel()
+        await asyncio.sleep(0)
+
+        commands.release.set()
+        await busy
+        await asyncio.sleep(0)
+        assert commands.ran == ["busy"]
+        assert cancelled.cancelled()
+
+    asyncio.run(_run())
+
+
+def test_queue_keeps_coalesced_command_for_remaining_caller():
+    """Cancelling one of two callers of a coalesced command still sends it for the other."""
+    async def _run() -> None:
+        commands = _Commands()
+        queue, busy = await _busy_queue(commands)
+        cancelled = asyncio.create_task(queue.submit(commands("img a"), key="set:img"))
+        waiting = asyncio.create_task(queue.submit(commands("img b"), key="set:img"))
+        await asyncio.sleep(0)
+        cancelled.cancel()
+        await asyncio.sleep(0)
+
+        commands.release.set()
+        assert await waiting == "img b"
+        await busy
+        assert commands.ran == ["busy", "img b"]
+
+    asyncio.run(_run())
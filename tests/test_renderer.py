@@ -0,0 +1,45 @@
+"""Tests for the local subject/text renderer."""
+import os
+
+import pytest
+from PIL import ImageFont
+
+from custom_components.geek_magic import renderer
+from custom_components.geek_magic.const import DEFAULT_HTML_TEMPLATE
+
+DEJAVU = renderer.FONT_CANDIDATES[False][-1]
+
+
+@pytest.fixture(autouse=True)
+def clear_font_caches():
+    """Forget fonts and glyphs looked up by other tests."""
+    for cached in (renderer._load_truetype, renderer._load_font, renderer._has_glyph):
+        cached.cache_clear()
+    yield
+    for cached in (renderer._load_truetype, renderer._load_font, renderer._has_glyph):
+        cached.cache_clear()
+
+
+def test_latin_font_sends_non_latin_text_to_render_service(monkeypatch):
+    """Text the font has no glyphs for would come out as boxes."""
+    # The Pillow default font covers Latin only
+    monkeypatch.setattr(renderer, "_load_truetype", lambda bold, size: ImageFont.load_default(size))
+
+    assert renderer.can_render_locally(DEFAULT_HTML_TEMPLATE, "Hello", "Dinner is ready")
+    assert not renderer.can_render_locally(DEFAULT_HTML_TEMPLATE, "Привет", "Dinner is ready")
+    assert not renderer.can_render_locally(DEFAULT_HTML_TEMPLATE, "Hello", "晚饭好了")
+
+
+def test_without_installed_font_nothing_is_rendered_locally(monkeypatch):
+    """The Pillow default font is never trusted to match the render service."""
+    monkeypatch.setattr(renderer, "FONT_CANDIDATES", {False: (), True: ()})
+
+    assert not renderer.can_render_locally(DEFAULT_HTML_TEMPLATE, "Hello", "World")
+    assert not renderer.can_render_locally(DEFAULT_HTML_TEMPLATE, "Привет", "мир")
+
+
+@pytest.mark.skipif(not os.path.exists(DEJAVU), reason="DejaVu Sans is not installed")
+def test_dejavu_renders_cyrillic_locally():
+    """Scripts covered by the installed font stay local."""
+    assert renderer.can_render_locally(DEFAULT_HTML_TEMPLATE, "Привет", "Ужин готов")
+    assert renderer.render_text("Привет", "Ужин готов").startswith(b"\xff\xd8")